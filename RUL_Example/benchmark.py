@@ -0,0 +1,180 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cmapss_cache import COLUMNS, DATASET_DIR, SENSOR_COLUMNS, ensure_cached, load_table, parse_text
+from rolling_features import rolling_features
+from rul_labels import train_rul
+from sequence_windows import WindowDataset
+from trajectory_index import index_table
+
+FILES = ('train_FD001.txt', 'test_FD001.txt', 'test_FD003.txt')
+CASES = ('cold_parse', 'cached_load', 'labels', 'windowing', 'features')
+SCALES = (1, 10, 100)
+
+
+# ساخت ناوگان مصنوعی با تکرار موتورهای یک فایل (با شماره موتور جدید و نویز کوچک روی حسگرها)
+def synthetic_fleet(path, scale, out_dir, seed=42):
+    if scale == 1:
+        return path
+    name = os.path.basename(path)
+    out = os.path.join(out_dir, f'x{scale}_{name}')
+    if os.path.exists(out):
+        return out
+    base = pd.DataFrame(parse_text(path))
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in range(scale):
+        df = base.copy()
+        df['unit'] += i * int(base['unit'].max())
+        noise = rng.normal(0, 1e-3, (len(df), len(SENSOR_COLUMNS))) * df[SENSOR_COLUMNS].std().to_numpy()
+        df[SENSOR_COLUMNS] = (df[SENSOR_COLUMNS] + noise).round(4)
+        copies.append(df)
+    tmp = f'{out}.tmp-{os.getpid()}'
+    pd.concat(copies)[COLUMNS].to_csv(tmp, sep=' ', header=False, index=False)
+    os.replace(tmp, out)
+    return out
+
+
+# بیشینه RSS پردازش جاری؛ در لینوکس از VmHWM خوانده می‌شود چون ru_maxrss بعد از exec
+# مقدار پردازش والد را به ارث می‌برد
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss در لینوکس بر حسب کیلوبایت و در macOS بر حسب بایت است
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+# صفر کردن شمارنده بیشینه RSS (فقط لینوکس) تا اوج حافظه خود مرحله اندازه‌گیری شود
+def _reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+# اجرای یک مورد در پردازش تازه؛ آماده‌سازی زمان‌گیری نمی‌شود
+def run_case(case, path, cache_dir, window=30):
+    if case in ('labels', 'windowing', 'features'):
+        table, index = index_table(load_table(path, cache_dir=cache_dir))
+    if case in ('windowing', 'features'):
+        features = table.matrix(SENSOR_COLUMNS)
+    _reset_peak_rss()
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    if case == 'cold_parse':
+        rows = len(parse_text(path)['unit'])
+    elif case == 'cached_load':
+        loaded = load_table(path, cache_dir=cache_dir)
+        # لمس همه ستون‌ها تا خواندن واقعی از دیسک/حافظه هم سنجیده شود
+        rows = loaded.n_rows
+        for name in loaded.names:
+            loaded[name].sum()
+    elif case == 'labels':
+        rows = len(train_rul(index, table['cycle'], cap=125))
+    elif case == 'windowing':
+        dataset = WindowDataset(features, index, window)
+        rows = sum(len(x) for x, _ in dataset.batches(1024))
+    elif case == 'features':
+        rows = len(rolling_features(features, index, window)[0])
+    else:
+        raise ValueError(f'unknown benchmark case: {case!r}')
+    wall = time.perf_counter() - start
+    return {'wall_s': wall, 'rows': rows, 'rows_per_s': rows / wall if wall > 0 else float('inf'),
+            'rss_before_mb': rss_before, 'peak_rss_mb': _peak_rss_mb()}
+
+
+def run(files=FILES, cases=CASES, scales=SCALES, repeat=3, work_dir=None, window=30):
+    work_dir = work_dir or os.path.join(tempfile.gettempdir(), 'rul_benchmark')
+    cache_dir = os.path.join(work_dir, 'cache')
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    # هر اجرا در یک پردازش جدید انجام می‌شود تا بیشینه RSS هر مرحله جداگانه اندازه‌گیری شود
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx, max_tasks_per_child=1) as pool:
+        for name in files:
+            for scale in scales:
+                path = synthetic_fleet(os.path.join(DATASET_DIR, name), scale, work_dir)
+                ensure_cached(path, cache_dir=cache_dir)
+                for case in cases:
+                    runs = [pool.submit(run_case, case, path, cache_dir, window).result() for _ in range(repeat)]
+                    best = min(runs, key=lambda r: r['wall_s'])
+                    best['peak_rss_mb'] = max(r['peak_rss_mb'] for r in runs)
+                    results.append({'case': case, 'file': name, 'scale': scale, **best})
+                    print(f"{case:12s} {name:16s} x{scale:<4d} {best['wall_s']:9.4f} s "
+                          f"{best['rows_per_s']:14,.0f} rows/s {best['peak_rss_mb']:8.1f} MB", flush=True)
+    meta = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat, 'window': window}
+    return {'meta': meta, 'results': results}
+
+
+# مقایسه دو فایل نتایج؛ افزایش زمان بیش از threshold (نسبی) به عنوان پسرفت علامت‌گذاری می‌شود
+def compare(old, new, threshold=0.1):
+    key = lambda r: (r['case'], r['file'], r['scale'])
+    before = {key(r): r for r in old['results']}
+    rows = []
+    for r in new['results']:
+        prev = before.get(key(r))
+        if prev is None:
+            continue
+        ratio = r['wall_s'] / prev['wall_s'] if prev['wall_s'] > 0 else float('inf')
+        rows.append({'case': r['case'], 'file': r['file'], 'scale': r['scale'],
+                     'old_s': prev['wall_s'], 'new_s': r['wall_s'], 'ratio': ratio,
+                     'regression': ratio > 1 + threshold})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the RUL data path')
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('run', help='time every case and write a JSON results file')
+    bench.add_argument('--files', nargs='+', default=list(FILES))
+    bench.add_argument('--cases', nargs='+', default=list(CASES), choices=CASES)
+    bench.add_argument('--scales', nargs='+', type=int, default=list(SCALES))
+    bench.add_argument('--repeat', type=int, default=3)
+    bench.add_argument('--window', type=int, default=30)
+    bench.add_argument('--work-dir', help='where synthetic fleets and their caches are kept')
+    bench.add_argument('--out', default='benchmark_results.json')
+    cmp = sub.add_parser('compare', help='compare two results files and flag regressions')
+    cmp.add_argument('old')
+    cmp.add_argument('new')
+    cmp.add_argument('--threshold', type=float, default=0.1, help='allowed relative slowdown (0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        result = run(args.files, args.cases, args.scales, args.repeat, args.work_dir, args.window)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=1)
+        return 0
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows = compare(old, new, args.threshold)
+    for r in rows:
+        flag = 'REGRESSION' if r['regression'] else ''
+        print(f"{r['case']:12s} {r['file']:16s} x{r['scale']:<4d} {r['old_s']:9.4f} -> {r['new_s']:9.4f} s "
+              f"({r['ratio']:5.2f}x) {flag}")
+    return 1 if any(r['regression'] for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# نام ستون‌های فایل‌های C-MAPSS (بر اساس readme.txt: شماره موتور، سیکل، سه تنظیم عملیاتی و ۲۱ حسگر)
+SETTING_COLUMNS = ['setting_1', 'setting_2', 'setting_3']
+SENSOR_COLUMNS = [f'sensor_{i}' for i in range(1, 22)]
+COLUMNS = ['unit', 'cycle'] + SETTING_COLUMNS + SENSOR_COLUMNS
+INT_COLUMNS = ('unit', 'cycle')
+
+# مسیرهای پیش‌فرض داده و حافظه نهان
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dataset')
+ZIP_PATH = os.path.join(DATASET_DIR, 'Dataset_NASA_aircraft_sensor.zip')
+CACHE_DIR = os.path.join(DATASET_DIR, '.cache')
+
+# با تغییر قالب ذخیره‌سازی، این شماره افزایش می‌یابد تا حافظه نهان قدیمی استفاده نشود
+CACHE_FORMAT = 1
+
+
+class CmapssTable:
+    # جدول ستونی: هر ستون یک آرایه numpy نگاشت‌شده در حافظه (memmap) است
+    def __init__(self, columns, digest, cache_path):
+        self.columns = columns
+        self.digest = digest
+        self.cache_path = cache_path
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    @property
+    def n_rows(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    # ساخت ماتریس دوبعدی (سطر × ستون) از ستون‌های انتخابی؛ این تنها جایی است که داده کپی می‌شود
+    def matrix(self, names, dtype=np.float64):
+        out = np.empty((self.n_rows, len(names)), dtype=dtype)
+        for j, name in enumerate(names):
+            out[:, j] = self.columns[name]
+        return out
+
+
+# پیدا کردن فایل داده: ابتدا در پوشه Dataset و سپس داخل فایل zip (بدون استخراج روی دیسک)
+def find_source(filename, dataset_dir=DATASET_DIR, zip_path=ZIP_PATH):
+    path = os.path.join(dataset_dir, filename)
+    if os.path.exists(path):
+        return path, None
+    if zipfile.is_zipfile(zip_path):
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                if os.path.basename(info.filename) == filename:
+                    return zip_path, info.filename
+    raise FileNotFoundError(f'{filename} not found in {dataset_dir} or {zip_path}')
+
+
+# کلید حافظه نهان: هش محتوای فایل، یا CRC32 ذخیره‌شده در zip برای اعضای فایل فشرده
+def source_digest(path, member=None):
+    if member is not None:
+        with zipfile.ZipFile(path) as zf:
+            info = zf.getinfo(member)
+        return f'zip-{info.CRC:08x}-{info.file_size}'
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return f'file-{h.hexdigest()}'
+
+
+# خواندن متن خام یک فایل (یا عضو zip) و تبدیل آن به ستون‌های numpy
+def parse_text(path, member=None):
+    if member is not None:
+        with zipfile.ZipFile(path) as zf:
+            source = io.BytesIO(zf.read(member))
+    else:
+        source = path
+    df = pd.read_csv(source, sep=r'\s+', header=None, usecols=range(len(COLUMNS)),
+                     names=COLUMNS, dtype={name: np.float64 for name in COLUMNS})
+    columns = {}
+    for name in COLUMNS:
+        values = df[name].to_numpy()
+        columns[name] = values.astype(np.int32) if name in INT_COLUMNS else values
+    return columns
+
+
+# نوشتن ستون‌ها به صورت فایل‌های .npy جداگانه؛ ابتدا در پوشه موقت و سپس جابه‌جایی اتمی
+def write_cache(target, columns, source=None):
+    tmp = f'{target}.tmp-{os.getpid()}'
+    os.makedirs(tmp, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(tmp, f'{name}.npy'), np.ascontiguousarray(values))
+    meta = {'format': CACHE_FORMAT, 'columns': list(columns),
+            'n_rows': len(next(iter(columns.values()))), 'source': source}
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=1)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # پردازش دیگری زودتر همین حافظه نهان را ساخته است
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# مسیر پوشه حافظه نهان یک فایل؛ در صورت نبود، فایل یک بار تجزیه و ذخیره می‌شود
+def ensure_cached(path, member=None, cache_dir=CACHE_DIR):
+    digest = source_digest(path, member)
+    target = os.path.join(cache_dir, f'v{CACHE_FORMAT}-{digest}')
+    if not os.path.isdir(target):
+        os.makedirs(cache_dir, exist_ok=True)
+        source = os.path.basename(path) if member is None else f'{os.path.basename(path)}:{member}'
+        write_cache(target, parse_text(path, member), source=source)
+    return digest, target
+
+
+# بارگذاری جدول از حافظه نهان به صورت memmap (بدون کپی و بدون تجزیه متن)
+def load_table(path, member=None, columns=None, cache_dir=CACHE_DIR):
+    digest, target = ensure_cached(path, member, cache_dir)
+    with open(os.path.join(target, 'meta.json')) as f:
+        meta = json.load(f)
+    names = meta['columns'] if columns is None else list(columns)
+    arrays = {name: np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r') for name in names}
+    return CmapssTable(arrays, digest, target)
+
+
+# بارگذاری یک زیرمجموعه با نام آن، مثلاً load_subset('train', 'FD001')
+def load_subset(kind, subset, **kwargs):
+    path, member = find_source(f'{kind}_{subset}.txt')
+    return load_table(path, member, **kwargs)
@@ -0,0 +1,215 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesRegressor
+from sklearn.linear_model import LassoCV
+
+from cmapss_cache import SENSOR_COLUMNS, SETTING_COLUMNS, find_source, load_subset
+from feature_pruning import column_mask
+from regimes import cached_regimes, fit_cached
+from rul_labels import cached_train_rul
+from trajectory_index import index_table
+
+EMBEDDED_METHODS = ('tree', 'l1')
+
+# امتیاز مدل پوششی برای هر زیرمجموعه ویژگی (کلید: داده، مدل، تعداد بخش و زیرمجموعه مرتب)؛
+# LRU با حداکثر _CACHE_SIZE درایه تا جستجوهای پیاپی روی داده‌های مختلف حافظه را پر نکنند
+_CACHE_SIZE = 4096
+_cache = OrderedDict()
+
+# داده مشترک پردازش‌های کارگر؛ یک بار در شروع هر کارگر تنظیم می‌شود
+_worker = {}
+
+
+# حسگرهای نرمال‌شده (z-score هر شرایط کاری) و RUL محدودشده داده آموزش یک زیرمجموعه
+# بدون sensors، حسگرهای نگه‌داشته‌شده ماسک هرس داده آموزش (مانند pipeline.prepare_subset) استفاده می‌شوند و
+# ستون‌هایی که پس از نرمال‌سازی ثابت می‌مانند هم کنار می‌روند تا جستجوی پوششی روی آن‌ها برازش نکند
+# خروجی (X، y، شماره بخش اعتبارسنجی هر سطر بر اساس موتور، نام حسگرها)
+def load_features(subset='FD001', cap=125, folds=3, sensors=None):
+    if sensors is None:
+        mask = column_mask(*find_source(f'train_{subset}.txt'))
+        sensors = [c for c in mask['kept'] if c in SENSOR_COLUMNS]
+    table = load_subset('train', subset, columns=['unit', 'cycle'] + SETTING_COLUMNS + list(sensors))
+    normalizer = fit_cached(table, SETTING_COLUMNS, sensors)
+    table, index = index_table(table)
+    ids = cached_regimes(table, normalizer, SETTING_COLUMNS)
+    X = normalizer.transform(table.matrix(sensors), ids)
+    y = np.asarray(cached_train_rul(table, index, cap=cap), dtype=np.float64)
+    # همه سیکل‌های یک موتور در یک بخش قرار می‌گیرند تا اعتبارسنجی نشت زمانی نداشته باشد
+    groups = index.broadcast(np.arange(index.n_units) % folds)
+    varying = X.std(axis=0) > 0
+    return X[:, varying], y, groups, [c for c, keep in zip(sensors, varying) if keep]
+
+
+# قدرمطلق همبستگی Pearson هر ستون با هدف، برای همه ستون‌ها با یک ضرب ماتریسی؛ ستون ثابت امتیاز صفر می‌گیرد
+def correlation_scores(X, y):
+    xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (xc.T @ yc) / np.sqrt((xc ** 2).sum(axis=0) * (yc ** 2).sum())
+    return np.nan_to_num(np.abs(r))
+
+
+def _quantile_codes(values, bins):
+    edges = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1], axis=0)
+    if values.ndim == 1:
+        return np.searchsorted(edges, values, side='right')
+    return np.column_stack([np.searchsorted(edges[:, j], values[:, j], side='right')
+                            for j in range(values.shape[1])])
+
+
+# اطلاعات متقابل (nats) هر ستون با هدف با هیستوگرام هم‌فراوانی: کدهای دوبعدی همه ستون‌ها
+# با یک bincount شمرده می‌شوند (ستون × bin ویژگی × bin هدف)؛ ستون ثابت یک bin دارد و امتیاز صفر می‌گیرد
+def mutual_information(X, y, bins=16):
+    n, d = X.shape
+    x_codes = _quantile_codes(X, bins)
+    y_codes = _quantile_codes(y, bins)
+    flat = (np.arange(d) * bins * bins)[None, :] + x_codes * bins + y_codes[:, None]
+    joint = np.bincount(flat.ravel(), minlength=d * bins * bins).reshape(d, bins, bins) / n
+    px = joint.sum(axis=2, keepdims=True)
+    py = joint.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        terms = joint * np.log(joint / (px * py))
+    return np.nansum(terms, axis=(1, 2))
+
+
+def filter_scores(X, y, bins=16):
+    return {'correlation': correlation_scores(X, y), 'mutual_info': mutual_information(X, y, bins)}
+
+
+def _wrapper_model(seed):
+    return ExtraTreesRegressor(n_estimators=16, min_samples_leaf=32, n_jobs=1, random_state=seed)
+
+
+def _init_worker(X, y, groups, seed):
+    _worker.update(X=X, y=y, groups=groups, seed=seed)
+
+
+# برازش مدل روی همه بخش‌ها به جز fold و مجموع مربعات خطا روی همان بخش
+def _fold_sse(subset, fold):
+    X, y, groups = _worker['X'], _worker['y'], _worker['groups']
+    train = groups != fold
+    model = _wrapper_model(_worker['seed']).fit(X[train][:, subset], y[train])
+    error = model.predict(X[~train][:, subset]) - y[~train]
+    return float((error ** 2).sum())
+
+
+class SubsetScorer:
+    # امتیاز R² اعتبارسنجی گروهی (بر اساس موتور) یک مدل درختی روی زیرمجموعه‌ای از ستون‌ها
+    # برازش‌ها (زیرمجموعه × بخش) بین کارگرهای یک ProcessPoolExecutor پخش می‌شوند و امتیاز هر زیرمجموعه
+    # با کلید محتوای داده در _cache نگه داشته می‌شود، پس زیرمجموعه تکراری (در همین جستجو یا اجراهای بعدی
+    # در همان پردازش) دوباره برازش نمی‌شود
+    def __init__(self, X, y, groups, workers=None, seed=42):
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.groups = np.asarray(groups)
+        self.folds = np.unique(self.groups)
+        self.sst = float(((self.y - self.y.mean()) ** 2).sum())
+        h = hashlib.blake2b(digest_size=8)
+        for arr in (self.X, self.y, self.groups):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        self.key = (h.hexdigest(), seed)
+        self.fits = 0
+        self._pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                                         initargs=(self.X, self.y, self.groups, seed))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown()
+
+    def scores(self, subsets):
+        subsets = [tuple(sorted(s)) for s in subsets]
+        # امتیازها پیش از ارسال کارها خوانده می‌شوند تا خارج شدن درایه‌ها از LRU در همین فراخوانی بی‌اثر باشد
+        found = {s: _cache[self.key, s] for s in dict.fromkeys(subsets) if (self.key, s) in _cache}
+        for s in found:
+            _cache.move_to_end((self.key, s))
+        jobs = {s: [self._pool.submit(_fold_sse, list(s), f) for f in self.folds]
+                for s in dict.fromkeys(subsets) if s not in found}
+        for s, fold_jobs in jobs.items():
+            found[s] = _cache[self.key, s] = 1 - sum(job.result() for job in fold_jobs) / self.sst
+            self.fits += len(fold_jobs)
+            if len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        return np.array([found[s] for s in subsets])
+
+
+# انتخاب پیشرو: در هر گام همه نامزدها به صورت موازی امتیاز می‌گیرند و بهترین افزوده می‌شود
+# توقف وقتی بهبود R² کمتر از tol شود یا max_features ستون انتخاب شده باشد
+# خروجی (ترتیب انتخاب، R² پس از هر گام، بهبود R² هر ستون که برای ستون‌های انتخاب‌نشده صفر است)
+def forward_selection(scorer, max_features=None, tol=1e-3):
+    d = scorer.X.shape[1]
+    selected, history = [], []
+    gains = np.zeros(d)
+    best = 0.0
+    while len(selected) < (max_features or d):
+        candidates = [j for j in range(d) if j not in selected]
+        scores = scorer.scores([selected + [j] for j in candidates])
+        i = int(np.argmax(scores))
+        if scores[i] - best < tol:
+            break
+        gains[candidates[i]] = scores[i] - best
+        best = scores[i]
+        selected.append(candidates[i])
+        history.append(best)
+    return selected, history, gains
+
+
+# اهمیت ویژگی‌ها از یک مدل: 'tree' (کاهش ناخالصی جنگل ExtraTrees با همه هسته‌ها) یا
+# 'l1' (قدرمطلق ضرایب Lasso با اعتبارسنجی گروهی روی ستون‌های استانداردشده)
+def embedded_scores(X, y, groups, method='tree', seed=42):
+    if method not in EMBEDDED_METHODS:
+        raise ValueError(f'unknown embedded method: {method!r}')
+    if method == 'tree':
+        model = ExtraTreesRegressor(n_estimators=200, min_samples_leaf=8, n_jobs=-1, random_state=seed)
+        return model.fit(X, y).feature_importances_
+    std = X.std(axis=0)
+    Z = (X - X.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    folds = [(np.flatnonzero(groups != f), np.flatnonzero(groups == f)) for f in np.unique(groups)]
+    coef = np.abs(LassoCV(cv=folds, n_jobs=-1, random_state=seed).fit(Z, y).coef_)
+    return coef / coef.sum() if coef.sum() > 0 else coef
+
+
+# اجرای هر سه روش روی یک زیرمجموعه C-MAPSS؛ امتیازهای پوششی و درونی به جمع یک نرمال می‌شوند
+def importance_table(subset='FD001', cap=125, folds=3, workers=None, max_features=None, tol=1e-3,
+                     embedded='tree', bins=16, seed=42):
+    X, y, groups, names = load_features(subset, cap, folds)
+    scores = filter_scores(X, y, bins)
+    with SubsetScorer(X, y, groups, workers, seed) as scorer:
+        selected, history, gains = forward_selection(scorer, max_features, tol)
+    scores['wrapper'] = gains / gains.sum() if gains.sum() > 0 else gains
+    scores['embedded'] = embedded_scores(X, y, groups, embedded, seed)
+    result = {'subset': subset, 'features': names, 'selected': [names[j] for j in selected],
+              'r2_path': history, 'wrapper_fits': scorer.fits}
+    result.update({k: v.tolist() for k, v in scores.items()})
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Filter, wrapper and embedded feature importance for C-MAPSS RUL')
+    parser.add_argument('--subset', default='FD001')
+    parser.add_argument('--cap', type=int, default=125)
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-features', type=int, default=None)
+    parser.add_argument('--tol', type=float, default=1e-3, help='minimum R2 gain to keep adding features')
+    parser.add_argument('--embedded', choices=EMBEDDED_METHODS, default='tree')
+    parser.add_argument('--out', help='write scores to this JSON file (e.g. figs/feature_importance.json)')
+    args = parser.parse_args(argv)
+    result = importance_table(args.subset, args.cap, args.folds, args.workers, args.max_features, args.tol,
+                              args.embedded)
+    text = json.dumps(result, indent=1)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import json
+import os
+
+import numpy as np
+
+from cmapss_cache import SENSOR_COLUMNS, SETTING_COLUMNS, ensure_cached, find_source, load_table
+
+# ستون‌هایی که قابل حذف‌اند؛ شماره موتور و سیکل همیشه نگه داشته می‌شوند
+CANDIDATE_COLUMNS = SETTING_COLUMNS + SENSOR_COLUMNS
+MASK_FILE = 'prune_mask.json'
+
+
+class ColumnScanner:
+    # پویش جریانی واریانس (ادغام Welford/Chan بین تکه‌ها) و شمارش مقادیر یکتا برای هر ستون
+    def __init__(self, names, max_unique=16):
+        self.names = list(names)
+        self.max_unique = max_unique
+        self.count = 0
+        self.mean = np.zeros(len(self.names))
+        self.m2 = np.zeros(len(self.names))
+        self._uniques = [set() for _ in self.names]
+        self._saturated = np.zeros(len(self.names), dtype=bool)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n = len(chunk)
+        if n == 0:
+            return self
+        chunk_mean = chunk.mean(axis=0)
+        chunk_m2 = ((chunk - chunk_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        # شمارش مقادیر یکتا فقط تا سقف max_unique ادامه می‌یابد
+        for j in np.flatnonzero(~self._saturated):
+            self._uniques[j].update(np.unique(chunk[:, j]).tolist())
+            if len(self._uniques[j]) > self.max_unique:
+                self._saturated[j] = True
+                self._uniques[j] = set()
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    @property
+    def n_unique(self):
+        return np.array([self.max_unique + 1 if s else len(u) for s, u in zip(self._saturated, self._uniques)])
+
+    # انتخاب ستون‌ها: ستون‌های ثابت (کمتر از min_unique مقدار یکتا) یا با ضریب تغییرات کمتر از cv_tol حذف می‌شوند
+    def keep_mask(self, min_unique=3, cv_tol=1e-6):
+        std = np.sqrt(self.variance)
+        cv = std / np.maximum(np.abs(self.mean), 1e-12)
+        return (self.n_unique >= min_unique) & (cv >= cv_tol)
+
+
+# تقسیم ستون‌های یک جدول memmap به تکه‌های سطری
+def table_chunks(table, names, rows=65536):
+    for start in range(0, table.n_rows, rows):
+        yield np.column_stack([table[name][start:start + rows] for name in names])
+
+
+# پویش یک جدول و ذخیره ماسک ستون‌ها در کنار حافظه نهان آن
+def build_mask(table, names=CANDIDATE_COLUMNS, min_unique=3, cv_tol=1e-6, rows=65536):
+    scanner = ColumnScanner(names)
+    for chunk in table_chunks(table, names, rows):
+        scanner.update(chunk)
+    keep = scanner.keep_mask(min_unique, cv_tol)
+    mask = {'kept': [n for n, k in zip(names, keep) if k],
+            'dropped': [n for n, k in zip(names, keep) if not k],
+            'min_unique': min_unique, 'cv_tol': cv_tol,
+            'std': dict(zip(names, np.sqrt(scanner.variance).tolist())),
+            'n_unique': dict(zip(names, scanner.n_unique.tolist()))}
+    with open(os.path.join(table.cache_path, MASK_FILE), 'w') as f:
+        json.dump(mask, f, indent=1)
+    return mask
+
+
+# خواندن ماسک ذخیره‌شده یک فایل؛ در صورت نبود، یا اگر با آستانه‌های دیگری ساخته شده باشد، دوباره ساخته می‌شود
+def column_mask(path, member=None, min_unique=3, cv_tol=1e-6, **kwargs):
+    _, target = ensure_cached(path, member)
+    mask_path = os.path.join(target, MASK_FILE)
+    if os.path.exists(mask_path):
+        with open(mask_path) as f:
+            mask = json.load(f)
+        if mask['min_unique'] == min_unique and mask['cv_tol'] == cv_tol:
+            return mask
+    return build_mask(load_table(path, member, columns=CANDIDATE_COLUMNS), min_unique=min_unique, cv_tol=cv_tol,
+                      **kwargs)
+
+
+# بارگذاری فقط ستون‌های نگه‌داشته‌شده؛ ستون‌های حذف‌شده هرگز باز نمی‌شوند
+# mask_source: فایلی که ماسک از آن گرفته می‌شود (مثلاً داده آموزش برای فایل آزمون)
+# min_unique و cv_tol به column_mask و بقیه آرگومان‌ها به load_table داده می‌شوند
+def load_pruned(path, member=None, mask_source=None, min_unique=3, cv_tol=1e-6, **kwargs):
+    mask = column_mask(*(mask_source or (path, member)), min_unique=min_unique, cv_tol=cv_tol)
+    return load_table(path, member, columns=['unit', 'cycle'] + mask['kept'], **kwargs)
+
+
+# مثال: load_pruned_subset('test', 'FD001') ستون‌ها را بر اساس ماسک train_FD001 انتخاب می‌کند
+def load_pruned_subset(kind, subset, **kwargs):
+    return load_pruned(*find_source(f'{kind}_{subset}.txt'),
+                       mask_source=find_source(f'train_{subset}.txt'), **kwargs)
@@ -0,0 +1,165 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from cmapss_cache import COLUMNS, SENSOR_COLUMNS
+from rul_labels import train_rul
+from rul_model import RidgeWindowModel
+from sequence_windows import WindowDataset
+from trajectory_index import load_indexed_subset
+
+
+class OnlineScorer:
+    # امتیازدهی جریانی: هر سطر جدید (۲۶ ستونی مانند test_FD001.txt) یک تخمین RUL تولید می‌کند
+    # برای هر موتور یک بافر حلقوی از N سیکل آخر نگه داشته می‌شود و آمار نرمال‌سازی به صورت
+    # جریانی (Welford) به‌روز می‌شود؛ هزینه هر سطر O(طول پنجره) است
+    def __init__(self, model, columns, window, mean, m2, count, max_units=256):
+        self.model = model
+        self.columns = list(columns)
+        self.window = window
+        self._column_idx = np.array([COLUMNS.index(c) for c in self.columns])
+        self.mean = np.array(mean, dtype=np.float64)
+        self.m2 = np.array(m2, dtype=np.float64)
+        self.count = int(count)
+        # تعداد سطرهای ردشده (کوتاه یا غیرعددی) و علت آخرین آن‌ها
+        self.skipped = 0
+        self.last_error = None
+        self._slots = {}
+        self._buffer = np.zeros((max_units, window, len(self.columns)))
+        self._pos = np.zeros(max_units, dtype=np.int64)
+        self._filled = np.zeros(max_units, dtype=np.int64)
+        self._steps = np.arange(window)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        model, extra = RidgeWindowModel.load(path)
+        return cls(model, [str(c) for c in extra['columns']], int(extra['window']),
+                   extra['mean'], extra['m2'], int(extra['count']), **kwargs)
+
+    def _slot(self, unit):
+        slot = self._slots.get(unit)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == len(self._buffer):
+                # افزایش دو برابری ظرفیت بافر برای موتورهای جدید
+                grow = len(self._buffer)
+                self._buffer = np.concatenate([self._buffer, np.zeros_like(self._buffer)])
+                self._pos = np.concatenate([self._pos, np.zeros(grow, dtype=np.int64)])
+                self._filled = np.concatenate([self._filled, np.zeros(grow, dtype=np.int64)])
+            self._slots[unit] = slot
+        return slot
+
+    # به‌روزرسانی با یک سطر و بازگرداندن تخمین RUL برای موتور آن سطر
+    def update(self, unit, values):
+        # به‌روزرسانی جریانی میانگین و واریانس (Welford)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+
+        slot = self._slot(unit)
+        pos = self._pos[slot]
+        self._buffer[slot, pos] = values
+        self._pos[slot] = (pos + 1) % self.window
+        filled = min(self._filled[slot] + 1, self.window)
+        self._filled[slot] = filled
+
+        # ترتیب زمانی پنجره از قدیمی به جدید؛ پنجره ناقص با تکرار قدیمی‌ترین سیکل پر می‌شود
+        if filled == self.window:
+            order = (self._pos[slot] + self._steps) % self.window
+        else:
+            order = np.maximum(self._steps - (self.window - filled), 0)
+        std = np.sqrt(self.m2 / max(self.count - 1, 1))
+        std[std < 1e-8] = 1.0
+        window = (self._buffer[slot, order] - self.mean) / std
+        return self.model.predict_one(window)
+
+    # امتیازدهی یک خط متنی؛ خروجی (موتور، سیکل، RUL)
+    # سطر خالی نادیده گرفته می‌شود؛ سطر کوتاه یا غیرعددی بدون تغییر آمار و بافرها رد می‌شود (خروجی None)
+    # و در skipped شمرده می‌شود تا یک سطر خراب جریان طولانی stdin یا --follow را متوقف نکند
+    def score_line(self, line):
+        fields = line.split()
+        if not fields:
+            return None
+        try:
+            if len(fields) < len(COLUMNS):
+                raise ValueError(f'expected {len(COLUMNS)} fields, got {len(fields)}')
+            row = np.array(fields[:len(COLUMNS)], dtype=np.float64)
+            unit, cycle = int(row[0]), int(row[1])
+        except (ValueError, OverflowError) as exc:
+            self.skipped += 1
+            self.last_error = exc
+            return None
+        return unit, cycle, self.update(unit, row[self._column_idx])
+
+    # errors: جریانی (مثلاً sys.stderr) که شماره و علت هر سطر ردشده در آن نوشته می‌شود
+    def score_lines(self, lines, errors=None):
+        for number, line in enumerate(lines, 1):
+            skipped = self.skipped
+            result = self.score_line(line)
+            if result is not None:
+                yield result
+            elif errors is not None and self.skipped > skipped:
+                errors.write(f'skipped line {number}: {self.last_error}\n')
+
+
+# آموزش مدل خطی پنجره‌ای روی داده آموزش و ذخیره آن همراه با آمار نرمال‌سازی اولیه
+def fit_model(subset='FD001', window=30, cap=125, columns=SENSOR_COLUMNS, alpha=1.0):
+    table, index = load_indexed_subset('train', subset)
+    features = table.matrix(columns)
+    mean = features.mean(axis=0)
+    m2 = ((features - mean) ** 2).sum(axis=0)
+    std = np.sqrt(m2 / max(len(features) - 1, 1))
+    std[std < 1e-8] = 1.0
+    features -= mean
+    features /= std
+    targets = train_rul(index, table['cycle'], cap=cap).astype(np.float64)
+    dataset = WindowDataset(features, index, window, targets=targets)
+    model = RidgeWindowModel(alpha=alpha).fit(dataset)
+    return model, dict(columns=np.array(columns), window=window, mean=mean, m2=m2, count=len(features))
+
+
+# دنبال کردن انتهای یک فایل (مانند tail -f)؛ سطری که هنوز کامل نوشته نشده (بدون '\n' در انتها)
+# نگه داشته و با ادامه آن در خواندن‌های بعدی تکمیل می‌شود تا نیمه سطر به عنوان یک سطر کامل پردازش نشود
+def follow(path, interval=0.2):
+    with open(path) as f:
+        partial = ''
+        while True:
+            line = f.readline()
+            if not line:
+                time.sleep(interval)
+                continue
+            partial += line
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Streaming RUL scorer for C-MAPSS rows')
+    sub = parser.add_subparsers(dest='command', required=True)
+    fit = sub.add_parser('fit', help='train a window model on train_<subset>.txt')
+    fit.add_argument('--subset', default='FD001')
+    fit.add_argument('--window', type=int, default=30)
+    fit.add_argument('--cap', type=int, default=125)
+    fit.add_argument('--out', default='rul_model.npz')
+    score = sub.add_parser('score', help='score rows from stdin or a followed file')
+    score.add_argument('--model', default='rul_model.npz')
+    score.add_argument('--follow', help='tail this file instead of reading stdin')
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        model, extra = fit_model(args.subset, args.window, args.cap)
+        model.save(args.out, **extra)
+        return
+    scorer = OnlineScorer.from_file(args.model)
+    lines = follow(args.follow) if args.follow else sys.stdin
+    out = sys.stdout
+    for unit, cycle, rul in scorer.score_lines(lines, errors=sys.stderr):
+        out.write(f'{unit} {cycle} {rul:.2f}\n')
+
+
+if __name__ == '__main__':
+    main()
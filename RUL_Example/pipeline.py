@@ -0,0 +1,160 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cmapss_cache import SENSOR_COLUMNS, SETTING_COLUMNS, find_source, load_table
+from feature_pruning import column_mask
+from regimes import cached_regimes, fit_cached
+from rul_labels import cached_train_rul, last_cycle_rul, load_true_rul, train_rul_path
+from rolling_features import FEATURES, rolling_features
+from rul_model import RidgeWindowModel, normal_equations
+from sequence_windows import WindowDataset
+from trajectory_index import index_table
+
+SUBSETS = ('FD001', 'FD002', 'FD003', 'FD004')
+
+
+# فایل‌های لازم هر زیرمجموعه (آموزش، آزمون و RUL واقعی)؛ در صورت نبود هر کدام None
+def subset_sources(subset):
+    try:
+        return {kind: find_source(f'{kind}_{subset}.txt') for kind in ('train', 'test', 'RUL')}
+    except FileNotFoundError:
+        return None
+
+
+# ذخیره ماتریس ویژگی نرمال‌شده به صورت memmap در کنار حافظه نهان جدول؛
+# پردازش‌های کارگر همین فایل را بدون کپی (از طریق page cache مشترک) باز می‌کنند
+# با rolling، ویژگی‌های متحرک (میانگین، واریانس، شیب، کمینه، بیشینه، EWMA) هم اضافه می‌شوند
+# کلید فایل علاوه بر مراکز شرایط کاری، میانگین و انحراف معیار نرمال‌ساز و فهرست حسگرها را هم در بر دارد
+def _normalized_features(table, normalizer, sensors, rolling=None):
+    h = hashlib.blake2b(f'{list(sensors)} {rolling}'.encode(), digest_size=8)
+    for arr in (normalizer.mean_, normalizer.std_):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    key = h.hexdigest()
+    path = os.path.join(table.cache_path, f'features_{normalizer.fingerprint()}_{key}.npy')
+    if not os.path.exists(path):
+        table, index = index_table(table)
+        ids = cached_regimes(table, normalizer, SETTING_COLUMNS)
+        width = len(sensors) * (1 + (len(FEATURES) if rolling else 0))
+        tmp = f'{path}.tmp-{os.getpid()}.npy'
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=(table.n_rows, width))
+        normalized = normalizer.transform(table.matrix(sensors), ids, out=out[:, :len(sensors)])
+        if rolling:
+            out[:, len(sensors):] = rolling_features(normalized, index, rolling, fill_value=0.0)[0]
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    return path
+
+
+# مرحله ۱ (یک کار برای هر زیرمجموعه): بارگذاری، نرمال‌سازی شرایط کاری و برچسب‌گذاری
+def prepare_subset(subset, cap=125, rolling=None):
+    sources = subset_sources(subset)
+    mask = column_mask(*sources['train'])
+    sensors = [c for c in mask['kept'] if c in SENSOR_COLUMNS]
+    columns = ['unit', 'cycle'] + SETTING_COLUMNS + sensors
+    train = load_table(*sources['train'], columns=columns)
+    test = load_table(*sources['test'], columns=columns)
+    normalizer = fit_cached(train, SETTING_COLUMNS, sensors)
+    train, train_index = index_table(train)
+    cached_train_rul(train, train_index, cap=cap)
+    return {'subset': subset, 'sensors': sensors, 'sources': sources,
+            'n_features': len(sensors) * (1 + (len(FEATURES) if rolling else 0)),
+            'train_features': _normalized_features(train, normalizer, sensors, rolling),
+            'test_features': _normalized_features(test, normalizer, sensors, rolling),
+            'labels': train_rul_path(train, cap),
+            'n_units': train_index.n_units}
+
+
+def _open(path, member, features_path, labels_path=None):
+    table, index = index_table(load_table(path, member, columns=['unit', 'cycle']))
+    features = np.load(features_path, mmap_mode='r')
+    labels = None if labels_path is None else np.load(labels_path, mmap_mode='r')
+    return table, index, features, labels
+
+
+# مرحله ۲ (یک کار برای هر بخش از موتورها): انباشت معادلات نرمال روی پنجره‌های آن بخش
+def shard_equations(prepared, lo, hi, window):
+    _, index, features, labels = _open(*prepared['sources']['train'], prepared['train_features'], prepared['labels'])
+    dataset = WindowDataset(features, index, window, targets=labels)
+    ids = np.arange(index.offsets[lo], index.offsets[hi])
+    return normal_equations(dataset, ids=ids)
+
+
+# امتیاز ناهمسان NASA برای خطای پیش‌بینی (پیش‌بینی دیرتر از خرابی جریمه بیشتری دارد)
+def nasa_score(error):
+    return np.where(error < 0, np.exp(-error / 13) - 1, np.exp(error / 10) - 1)
+
+
+# مرحله ۳: حل مدل و ارزیابی روی آخرین پنجره هر موتور آزمون
+def evaluate_subset(prepared, xtx, xty, window, cap=125):
+    _, index, features, _ = _open(*prepared['sources']['test'], prepared['test_features'])
+    model = RidgeWindowModel().solve(xtx, xty, window, prepared['n_features'])
+    dataset = WindowDataset(features, index, window, last_only=True)
+    pred = model.predict(dataset.batch(np.arange(len(dataset)))[0])
+    true = last_cycle_rul(index, load_true_rul(f"RUL_{prepared['subset']}.txt"), cap=cap)
+    error = pred - true
+    return {'subset': prepared['subset'], 'n_units': len(error),
+            'sse': float((error ** 2).sum()), 'score': float(nasa_score(error).sum()),
+            'rmse': float(np.sqrt((error ** 2).mean()))}
+
+
+# ادغام معیارهای زیرمجموعه‌ها
+def merge_metrics(metrics):
+    n = sum(m['n_units'] for m in metrics)
+    return {'subsets': metrics, 'n_units': n,
+            'rmse': float(np.sqrt(sum(m['sse'] for m in metrics) / n)) if n else float('nan'),
+            'score': float(sum(m['score'] for m in metrics))}
+
+
+# اجرای موازی کل زنجیره روی زیرمجموعه‌ها و بخش‌های موتورها
+def run(subsets=SUBSETS, window=30, cap=125, workers=None, shards=1, rolling=None):
+    runnable = [s for s in subsets if subset_sources(s) is not None]
+    skipped = [s for s in subsets if s not in runnable]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n = len(runnable)
+        prepared = list(pool.map(prepare_subset, runnable, [cap] * n, [rolling] * n))
+        jobs = []
+        for p in prepared:
+            bounds = np.linspace(0, p['n_units'], min(shards, p['n_units']) + 1).astype(int)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                jobs.append((p['subset'], pool.submit(shard_equations, p, lo, hi, window)))
+        totals = {}
+        for subset, job in jobs:
+            xtx, xty = job.result()
+            if subset in totals:
+                totals[subset][0] += xtx
+                totals[subset][1] += xty
+            else:
+                totals[subset] = [xtx, xty]
+        evaluated = [pool.submit(evaluate_subset, p, *totals[p['subset']], window, cap) for p in prepared]
+        result = merge_metrics([job.result() for job in evaluated])
+    result['skipped'] = skipped
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the C-MAPSS RUL pipeline over several subsets in parallel')
+    parser.add_argument('--subsets', nargs='+', default=list(SUBSETS))
+    parser.add_argument('--window', type=int, default=30)
+    parser.add_argument('--cap', type=int, default=125)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shards', type=int, default=1, help='engine shards per subset')
+    parser.add_argument('--rolling', type=int, default=None,
+                        help='append rolling-window features computed over this many cycles')
+    parser.add_argument('--out', help='write merged metrics to this JSON file')
+    args = parser.parse_args(argv)
+    result = run(args.subsets, args.window, args.cap, args.workers, args.shards, args.rolling)
+    text = json.dumps(result, indent=1)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+# دقت گرد کردن هر تنظیم عملیاتی برای جدا کردن شش شرایط کاری FD002/FD004
+ROUND_DECIMALS = (0, 2, 0)
+
+
+class RegimeNormalizer:
+    # خوشه‌بندی شرایط کاری (سه ستون تنظیمات) و نرمال‌سازی z-score حسگرها به تفکیک هر شرایط
+    # method: 'round' (دسته‌بندی دقیق با گرد کردن) یا 'kmeans'
+    def __init__(self, method='round', n_regimes=6, decimals=ROUND_DECIMALS, random_state=42):
+        if method not in ('round', 'kmeans'):
+            raise ValueError(f'unknown regime method: {method!r}')
+        self.method = method
+        self.n_regimes = n_regimes
+        self.decimals = decimals
+        self.random_state = random_state
+
+    # یافتن مرکز شرایط کاری و آمار هر حسگر در هر شرایط
+    def fit(self, settings, sensors):
+        settings = np.asarray(settings, dtype=np.float64)
+        if self.method == 'round':
+            rounded = np.column_stack([np.round(settings[:, j], d) for j, d in enumerate(self.decimals)])
+            self.centers_, ids = np.unique(rounded, axis=0, return_inverse=True)
+            ids = ids.ravel()
+        else:
+            km = KMeans(n_clusters=self.n_regimes, n_init=10, random_state=self.random_state).fit(settings)
+            self.centers_, ids = km.cluster_centers_, km.labels_
+        self._set_scale()
+        self.fit_stats(ids, sensors)
+        self.labels_ = ids
+        return self
+
+    def _set_scale(self):
+        spread = np.ptp(self.centers_, axis=0) if len(self.centers_) > 1 else np.ones(self.centers_.shape[1])
+        self.scale_ = np.where(spread > 0, spread, 1.0)
+
+    # میانگین و انحراف معیار هر حسگر در هر شرایط، در یک گذر گروهی (ضرب ماتریس one-hot)
+    def fit_stats(self, ids, sensors):
+        sensors = np.asarray(sensors, dtype=np.float64)
+        k = len(self.centers_)
+        onehot = (ids[None, :] == np.arange(k)[:, None]).astype(np.float64)
+        counts = onehot.sum(axis=1)
+        if np.any(counts == 0):
+            raise ValueError('every regime needs at least one row')
+        self.counts_ = counts
+        self.mean_ = onehot @ sensors / counts[:, None]
+        var = onehot @ (sensors - self.mean_[ids]) ** 2 / counts[:, None]
+        std = np.sqrt(var)
+        # حسگرهای ثابت در یک شرایط فقط مرکز می‌شوند
+        self.std_ = np.where(std > 1e-8, std, 1.0)
+        return self
+
+    # تخصیص هر سطر به نزدیک‌ترین مرکز شرایط کاری (برای داده آزمون بدون برازش دوباره)
+    def assign(self, settings):
+        scaled = np.asarray(settings, dtype=np.float64) / self.scale_
+        centers = self.centers_ / self.scale_
+        d2 = (scaled ** 2).sum(axis=1)[:, None] - 2 * scaled @ centers.T + (centers ** 2).sum(axis=1)[None, :]
+        return np.argmin(d2, axis=1)
+
+    # اعمال z-score هر شرایط روی همه حسگرها؛ با out نتیجه درجا نوشته می‌شود
+    def transform(self, sensors, ids, out=None):
+        out = np.subtract(sensors, self.mean_[ids], out=out)
+        np.divide(out, self.std_[ids], out=out)
+        return out
+
+    def fit_transform(self, settings, sensors, out=None):
+        self.fit(settings, sensors)
+        return self.transform(sensors, self.labels_, out=out)
+
+    # شناسه یکتای مدل برازش‌شده برای نام‌گذاری فایل‌های حافظه نهان
+    def fingerprint(self):
+        h = hashlib.blake2b(digest_size=8)
+        for arr in (self.centers_, self.scale_):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+
+    def save(self, path):
+        np.savez(path, method=self.method, n_regimes=self.n_regimes, decimals=np.asarray(self.decimals),
+                 centers=self.centers_, scale=self.scale_, mean=self.mean_, std=self.std_, counts=self.counts_)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        self = cls(method=str(data['method']), n_regimes=int(data['n_regimes']),
+                   decimals=tuple(int(d) for d in data['decimals']))
+        self.centers_, self.scale_ = data['centers'], data['scale']
+        self.mean_, self.std_, self.counts_ = data['mean'], data['std'], data['counts']
+        return self
+
+
+def _stats_path(table, normalizer, columns):
+    params = f'{normalizer.n_regimes} {normalizer.decimals} {normalizer.random_state} ' + ' '.join(columns)
+    key = hashlib.blake2b(params.encode(), digest_size=4).hexdigest()
+    return os.path.join(table.cache_path, f'regime_{normalizer.method}_{key}.npz')
+
+
+# برازش یک بار روی جدول آموزش؛ آمار در کنار حافظه نهان جدول ذخیره و در اجراهای بعدی بازخوانی می‌شود
+def fit_cached(table, settings_columns, sensor_columns, method='round', **kwargs):
+    normalizer = RegimeNormalizer(method=method, **kwargs)
+    path = _stats_path(table, normalizer, list(settings_columns) + list(sensor_columns))
+    if os.path.exists(path):
+        return RegimeNormalizer.load(path)
+    normalizer.fit(table.matrix(settings_columns), table.matrix(sensor_columns))
+    normalizer.save(path)
+    return normalizer
+
+
+# شرایط کاری هر سطر یک جدول (آموزش یا آزمون)، ذخیره‌شده در حافظه نهان همان جدول
+def cached_regimes(table, normalizer, settings_columns):
+    path = os.path.join(table.cache_path, f'regimes_{normalizer.fingerprint()}.npy')
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    ids = normalizer.assign(table.matrix(settings_columns)).astype(np.int16)
+    tmp = f'{path}.tmp-{os.getpid()}.npy'
+    np.save(tmp, ids)
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,138 @@
+import numpy as np
+from scipy.signal import lfilter
+
+FEATURES = ('mean', 'var', 'slope', 'min', 'max', 'ewma')
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+# ابتدای پنجره هر سطر؛ پنجره‌ها هرگز از ابتدای مسیر همان موتور عقب‌تر نمی‌روند
+def window_starts(index, window):
+    rows = np.arange(index.n_rows)
+    return np.maximum(rows - window + 1, index.broadcast(index.starts))
+
+
+# مجموع متحرک با جمع تجمعی (هزینه O(n) مستقل از طول پنجره)
+def _window_sums(values, starts):
+    cs = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=cs[1:])
+    return cs[1:] - cs[starts]
+
+
+def _apply_min_periods(out, counts, min_periods):
+    out[counts < min_periods] = np.nan
+    return out
+
+
+# میانگین متحرک؛ min_periods مانند pandas (پیش‌فرض برابر طول پنجره)
+def rolling_mean(values, index, window, min_periods=None):
+    values = _as_2d(values)
+    starts = window_starts(index, window)
+    counts = (np.arange(len(values)) - starts + 1)[:, None]
+    center = values.mean(axis=0)
+    out = _window_sums(values - center, starts) / counts + center
+    return _apply_min_periods(out, counts[:, 0], window if min_periods is None else min_periods)
+
+
+# واریانس متحرک نمونه‌ای (ddof=1)؛ داده پیش از جمع تجمعی مرکز می‌شود تا خطای گرد کردن کم شود
+def rolling_var(values, index, window, min_periods=None):
+    values = _as_2d(values)
+    starts = window_starts(index, window)
+    counts = (np.arange(len(values)) - starts + 1)[:, None]
+    centered = values - values.mean(axis=0)
+    s1 = _window_sums(centered, starts)
+    s2 = _window_sums(centered ** 2, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = np.maximum(s2 - s1 ** 2 / counts, 0) / (counts - 1)
+    return _apply_min_periods(out, counts[:, 0], max(2, window if min_periods is None else min_periods))
+
+
+# شیب روند (کمترین مربعات) در هر پنجره؛ زمان محلی هر موتور از صفر شروع می‌شود
+def rolling_slope(values, index, window, min_periods=None):
+    values = _as_2d(values)
+    starts = window_starts(index, window)
+    counts = (np.arange(len(values)) - starts + 1)[:, None]
+    t = index.local_rows().astype(np.float64)[:, None]
+    centered = values - values.mean(axis=0)
+    sy = _window_sums(centered, starts)
+    sty = _window_sums(t * centered, starts)
+    t_end = t
+    t_start = t - counts + 1
+    # مجموع t و t² روی بازه [t_start, t_end] به صورت بسته
+    st = (t_start + t_end) * counts / 2
+    stt = (t_end * (t_end + 1) * (2 * t_end + 1) - (t_start - 1) * t_start * (2 * t_start - 1)) / 6
+    denom = counts * stt - st ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = np.where(denom > 0, (counts * sty - st * sy) / denom, 0.0)
+    return _apply_min_periods(out, counts[:, 0], window if min_periods is None else min_periods)
+
+
+# بیشینه/کمینه متحرک با الگوریتم van Herk/Gil-Werman: بلوک‌هایی به طول پنجره که از ابتدای
+# هر موتور شروع می‌شوند، بیشینه پیشوندی و پسوندی هر بلوک، و ترکیب دو بلوک مجاور
+def _rolling_extreme(values, index, window, min_periods, ufunc, fill):
+    values = _as_2d(values)
+    n, f = values.shape
+    w = max(1, min(window, int(index.lengths.max()) if index.n_units else 1))
+    local = index.local_rows()
+    blocks_per_unit = -(-index.lengths // w)
+    block_offsets = np.concatenate([[0], np.cumsum(blocks_per_unit)])
+    block = index.broadcast(block_offsets[:-1]) + local // w
+    slot = local % w
+    grid = np.full((int(block_offsets[-1]), w, f), fill)
+    grid[block, slot] = values
+    prefix = ufunc.accumulate(grid, axis=1)[block, slot]
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1][block, slot]
+    starts = window_starts(index, window)
+    same_block = block[starts] == block
+    out = np.where(same_block[:, None], prefix, ufunc(suffix[starts], prefix))
+    counts = np.arange(n) - starts + 1
+    return _apply_min_periods(out, counts, window if min_periods is None else min_periods)
+
+
+def rolling_max(values, index, window, min_periods=None):
+    return _rolling_extreme(values, index, window, min_periods, np.maximum, -np.inf)
+
+
+def rolling_min(values, index, window, min_periods=None):
+    return _rolling_extreme(values, index, window, min_periods, np.minimum, np.inf)
+
+
+# میانگین متحرک نمایی (مانند pandas ewm(alpha, adjust=False)) که در ابتدای هر موتور از نو شروع می‌شود
+# فیلتر روی کل آرایه اجرا و سپس اثر موتور قبلی با پاسخ همگن (1-alpha)^k حذف می‌شود
+def ewma(values, index, alpha):
+    values = _as_2d(values)
+    decay = 1 - alpha
+    zi = decay * values[:1]
+    out = lfilter([alpha], [1, -decay], values, axis=0, zi=zi)[0]
+    first = index.broadcast(index.starts)
+    correction = out[first] - values[first]
+    with np.errstate(under='ignore'):
+        out -= decay ** index.local_rows()[:, None] * correction
+    return out
+
+
+# ماتریس ویژگی‌های متحرک برای همه حسگرهای همه موتورها؛ خروجی (ماتریس، نام ستون‌ها)
+# fill_value: جایگزین مقادیر NaN (مثلاً واریانس اولین سیکل هر موتور) برای استفاده مستقیم در مدل
+def rolling_features(values, index, window, names=None, features=FEATURES, alpha=0.3, min_periods=1,
+                     fill_value=None):
+    values = _as_2d(values)
+    names = names or [f'x{j}' for j in range(values.shape[1])]
+    funcs = {'mean': rolling_mean, 'var': rolling_var, 'slope': rolling_slope,
+             'min': rolling_min, 'max': rolling_max}
+    blocks, columns = [], []
+    for feature in features:
+        if feature == 'ewma':
+            block = ewma(values, index, alpha)
+        elif feature in funcs:
+            block = funcs[feature](values, index, window, min_periods)
+        else:
+            raise ValueError(f'unknown rolling feature: {feature!r}')
+        blocks.append(block)
+        columns += [f'{name}_{feature}' for name in names]
+    out = np.hstack(blocks)
+    if fill_value is not None:
+        out[np.isnan(out)] = fill_value
+    return out, columns
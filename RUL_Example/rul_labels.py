@@ -0,0 +1,70 @@
+import io
+import os
+import zipfile
+
+import numpy as np
+
+from cmapss_cache import find_source
+
+
+# خواندن بردار RUL واقعی موتورهای آزمون (RUL_FD00x.txt یا x.txt)، از پوشه Dataset یا داخل zip
+def load_true_rul(filename):
+    path, member = find_source(filename)
+    if member is not None:
+        with zipfile.ZipFile(path) as zf:
+            path = io.BytesIO(zf.read(member))
+    return np.loadtxt(path, dtype=np.int32, ndmin=1)
+
+
+def _check_units(index, per_unit):
+    if len(per_unit) != index.n_units:
+        raise ValueError(f'expected {index.n_units} RUL values (one per unit), got {len(per_unit)}')
+
+
+# RUL داده آموزش در یک گذر: بیشینه سیکل هر موتور روی سطرهای آن پخش و سیکل جاری از آن کم می‌شود
+# با cap، برچسب به صورت خطی-تکه‌ای محدود می‌شود (مثلاً ۱۲۵ سیکل)؛ با out نتیجه درجا نوشته می‌شود
+def train_rul(index, cycle, cap=None, out=None):
+    max_cycle = index.reduce(np.maximum, cycle)
+    out = np.take(max_cycle, index.row_positions, out=out)
+    np.subtract(out, cycle, out=out)
+    if cap is not None:
+        np.minimum(out, cap, out=out)
+    return out
+
+
+# RUL هر سطر داده آزمون: RUL واقعی در آخرین سیکل هر موتور به اضافه فاصله تا آن سیکل
+def test_rul(index, cycle, true_rul, cap=None, out=None):
+    true_rul = np.asarray(true_rul)
+    _check_units(index, true_rul)
+    last_cycle = np.asarray(cycle)[index.last_rows()]
+    out = np.take(true_rul + last_cycle, index.row_positions, out=out)
+    np.subtract(out, cycle, out=out)
+    if cap is not None:
+        np.minimum(out, cap, out=out)
+    return out
+
+
+# RUL هدف برای آخرین سیکل هر موتور آزمون (هم‌ترتیب با index.units)
+def last_cycle_rul(index, true_rul, cap=None):
+    true_rul = np.asarray(true_rul)
+    _check_units(index, true_rul)
+    return true_rul if cap is None else np.minimum(true_rul, cap)
+
+
+# مسیر فایل برچسب‌های آموزش یک جدول برای یک سقف RUL (مشترک بین cached_train_rul و کارگرهای pipeline)
+def train_rul_path(table, cap=None):
+    return os.path.join(table.cache_path, 'rul.npy' if cap is None else f'rul_cap{cap}.npy')
+
+
+# برچسب‌های آموزش در کنار حافظه نهان جدول ذخیره می‌شوند و بار بعد به صورت memmap خوانده می‌شوند
+def cached_train_rul(table, index, cap=None):
+    path = train_rul_path(table, cap)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    tmp = f'{path}.tmp-{os.getpid()}'
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.int32, shape=(index.n_rows,))
+    train_rul(index, table['cycle'], cap=cap, out=out)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode='r')
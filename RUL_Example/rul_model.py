@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class RidgeWindowModel:
+    # مدل خطی (رگرسیون ریج) روی پنجره نرمال‌شده (طول پنجره × حسگر) برای تخمین RUL
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    # برازش با انباشت معادلات نرمال روی دسته‌ها؛ حافظه فقط به اندازه یک دسته لازم است
+    def fit(self, dataset, batch_size=4096):
+        xtx, xty = normal_equations(dataset, batch_size=batch_size)
+        return self.solve(xtx, xty, dataset.window, dataset.features.shape[1])
+
+    # حل معادلات نرمال (که ممکن است از چند پردازش جداگانه جمع شده باشند)
+    def solve(self, xtx, xty, n_window, n_features):
+        reg = self.alpha * np.eye(len(xty))
+        reg[-1, -1] = 0
+        coef = np.linalg.solve(xtx + reg, xty)
+        self.coef_ = coef[:-1].reshape(n_window, n_features)
+        self.intercept_ = coef[-1]
+        return self
+
+    # پیش‌بینی برای دسته‌ای از پنجره‌ها (b × w × f)
+    def predict(self, windows):
+        return np.tensordot(windows, self.coef_, axes=([1, 2], [0, 1])) + self.intercept_
+
+    # پیش‌بینی برای یک پنجره (w × f)
+    def predict_one(self, window):
+        return float(np.vdot(window, self.coef_) + self.intercept_)
+
+    def save(self, path, **extra):
+        np.savez(path, alpha=self.alpha, coef=self.coef_, intercept=self.intercept_, **extra)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        self = cls(alpha=float(data['alpha']))
+        self.coef_, self.intercept_ = data['coef'], float(data['intercept'])
+        extra = {k: data[k] for k in data.files if k not in ('alpha', 'coef', 'intercept')}
+        return self, extra
+
+
+# معادلات نرمال X^T X و X^T y برای نمونه‌های ids (یا کل مجموعه)؛ نتایج چند بخش قابل جمع‌اند
+def normal_equations(dataset, ids=None, batch_size=4096):
+    d = dataset.window * dataset.features.shape[1] + 1
+    xtx = np.zeros((d, d))
+    xty = np.zeros(d)
+    for x, y in dataset.batches(batch_size, ids=ids):
+        x = np.column_stack([x.reshape(len(x), -1), np.ones(len(x))])
+        xtx += x.T @ x
+        xty += x.T @ y
+    return xtx, xty
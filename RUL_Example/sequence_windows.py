@@ -0,0 +1,84 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# نمای پنجره‌های لغزان (n-w+1 × w × f) روی یک آرایه دوبعدی، بدون کپی داده
+def sliding_windows(values, window):
+    values = np.asarray(values)
+    view = sliding_window_view(values, window, axis=0)
+    return np.moveaxis(view, -1, 1) if values.ndim == 2 else view
+
+
+class WindowDataset:
+    # مجموعه پنجره‌های (طول پنجره × حسگر) برای هر سیکل هر موتور
+    # هر نمونه با سطر پایانی پنجره مشخص می‌شود و پنجره‌ها هرگز از مرز موتور عبور نمی‌کنند
+    # pad: 'edge' (تکرار اولین سیکل)، 'zero' یا None (حذف نمونه‌های کوتاه‌تر از پنجره)
+    def __init__(self, features, index, window, targets=None, last_only=False, pad='edge'):
+        if pad not in ('edge', 'zero', None):
+            raise ValueError(f'unknown pad mode: {pad!r}')
+        self.features = np.asarray(features)
+        self.targets = None if targets is None else np.asarray(targets)
+        self.window = window
+        self.pad = pad
+        end_rows = index.last_rows() if last_only else np.arange(index.n_rows)
+        unit_starts = index.starts[index.row_positions[end_rows]]
+        if pad is None:
+            keep = end_rows - unit_starts + 1 >= window
+            end_rows, unit_starts = end_rows[keep], unit_starts[keep]
+        self.end_rows = end_rows
+        self.unit_starts = unit_starts
+        self.units = index.units[index.row_positions[end_rows]]
+        self._view = sliding_windows(self.features, window) if len(self.features) >= window else None
+        self._offsets = np.arange(window)
+
+    # ساخت مجموعه از ستون‌های یک جدول؛ تنها کپی، ماتریس ویژگی‌ها به اندازه خود جدول است
+    @classmethod
+    def from_table(cls, table, index, columns, window, dtype=np.float32, **kwargs):
+        return cls(table.matrix(columns, dtype=dtype), index, window, **kwargs)
+
+    def __len__(self):
+        return len(self.end_rows)
+
+    @property
+    def shape(self):
+        return (len(self), self.window, self.features.shape[1])
+
+    # یک پنجره؛ برای پنجره‌های کامل خروجی فقط یک نما (view) روی داده است
+    def __getitem__(self, i):
+        end = self.end_rows[i]
+        first = end - self.window + 1
+        if first >= self.unit_starts[i]:
+            return self._view[first]
+        return self._gather(np.array([end]), np.array([self.unit_starts[i]]))[0]
+
+    # پنجره‌های دارای padding با اندیس‌گذاری برداری ساخته می‌شوند
+    def _gather(self, ends, unit_starts):
+        rows = ends[:, None] - self.window + 1 + self._offsets[None, :]
+        short = rows < unit_starts[:, None]
+        out = self.features[np.maximum(rows, unit_starts[:, None])]
+        if self.pad == 'zero':
+            out[short] = 0
+        return out
+
+    # یک دسته از نمونه‌ها به همراه برچسب آخرین سیکل هر پنجره
+    def batch(self, ids):
+        ids = np.asarray(ids)
+        ends = self.end_rows[ids]
+        unit_starts = self.unit_starts[ids]
+        first = ends - self.window + 1
+        if self._view is not None and np.all(first >= unit_starts):
+            x = self._view[first]
+        else:
+            x = self._gather(ends, unit_starts)
+        y = None if self.targets is None else self.targets[ends]
+        return x, y
+
+    # تولید دسته‌ها به صورت جریانی؛ با shuffle فقط ترتیب اندیس‌ها جابه‌جا می‌شود
+    # ids: زیرمجموعه‌ای از نمونه‌ها (مثلاً موتورهای یک بخش در اجرای موازی)
+    def batches(self, batch_size, shuffle=False, seed=None, drop_last=False, ids=None):
+        order = np.arange(len(self)) if ids is None else np.array(ids)
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        stop = len(order) - len(order) % batch_size if drop_last else len(order)
+        for i in range(0, stop, batch_size):
+            yield self.batch(order[i:i + batch_size])
@@ -0,0 +1,123 @@
+import numpy as np
+
+from cmapss_cache import CmapssTable, load_subset, load_table
+
+
+class TrajectoryIndex:
+    # نمایه مسیر هر موتور: بازه سطرهای پیوسته هر موتور به صورت آرایه offset
+    # سطرهای موتور i در بازه offsets[i]:offsets[i+1] قرار دارند و بر اساس سیکل مرتب‌اند
+    def __init__(self, units, offsets, order=None):
+        self.units = units
+        self.offsets = offsets
+        self.order = order
+        # جدول جستجوی مستقیم شماره موتور به موقعیت آن (دسترسی O(1))
+        self._position = np.full(int(units.max()) + 1 if len(units) else 0, -1, dtype=np.int64)
+        self._position[units] = np.arange(len(units))
+        self._row_positions = None
+
+    # ساخت نمایه از ستون‌های موتور و سیکل؛ اگر جدول مرتب نباشد ترتیب مرتب‌سازی نگه داشته می‌شود
+    @classmethod
+    def build(cls, unit, cycle):
+        unit = np.asarray(unit)
+        cycle = np.asarray(cycle)
+        order = None
+        du = np.diff(unit)
+        if np.any(du < 0) or np.any((du == 0) & (np.diff(cycle) <= 0)):
+            order = np.lexsort((cycle, unit))
+            unit = unit[order]
+        starts = np.flatnonzero(np.r_[True, unit[1:] != unit[:-1]]) if len(unit) else np.zeros(0, np.int64)
+        offsets = np.append(starts, len(unit)).astype(np.int64)
+        return cls(np.array(unit[starts], dtype=np.int64), offsets, order)
+
+    @property
+    def n_units(self):
+        return len(self.units)
+
+    @property
+    def n_rows(self):
+        return int(self.offsets[-1])
+
+    @property
+    def starts(self):
+        return self.offsets[:-1]
+
+    @property
+    def ends(self):
+        return self.offsets[1:]
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def position(self, unit):
+        pos = self._position[unit] if 0 <= unit < len(self._position) else -1
+        if pos < 0:
+            raise KeyError(f'unit {unit} is not in the index')
+        return pos
+
+    # بازه سطرهای یک موتور
+    def span(self, unit):
+        pos = self.position(unit)
+        return slice(int(self.offsets[pos]), int(self.offsets[pos + 1]))
+
+    # بازه n سیکل آخر یک موتور (برای موتورهای کوتاه‌تر، کل مسیر)
+    def last_span(self, unit, n):
+        pos = self.position(unit)
+        start, end = int(self.offsets[pos]), int(self.offsets[pos + 1])
+        return slice(max(end - n, start), end)
+
+    def trajectory(self, values, unit):
+        return values[self.span(unit)]
+
+    def last(self, values, unit, n):
+        return values[self.last_span(unit, n)]
+
+    # اعمال ترتیب مرتب‌سازی روی یک ستون (برای جدول‌های از پیش مرتب، بدون کپی)
+    def sort(self, values):
+        return values if self.order is None else np.asarray(values)[self.order]
+
+    # موقعیت موتور هر سطر (برای پخش مقادیر هر موتور روی سطرهای آن)
+    @property
+    def row_positions(self):
+        if self._row_positions is None:
+            self._row_positions = np.repeat(np.arange(self.n_units), self.lengths)
+        return self._row_positions
+
+    # پخش یک مقدار به ازای هر موتور روی تمام سطرهای همان موتور
+    def broadcast(self, per_unit):
+        return np.asarray(per_unit)[self.row_positions]
+
+    # کاهش یک ستون به یک مقدار برای هر موتور در یک گذر، مثلاً reduce(np.maximum, cycle)
+    def reduce(self, ufunc, values):
+        return ufunc.reduceat(np.asarray(values), self.starts, axis=0)
+
+    # شماره سطر درون مسیر هر موتور (از صفر)
+    def local_rows(self):
+        return np.arange(self.n_rows) - self.broadcast(self.starts)
+
+    # اندیس آخرین سطر هر موتور
+    def last_rows(self):
+        return self.ends - 1
+
+    # ماتریس اندیس n سطر آخر همه موتورها (n_units × n)؛ مسیرهای کوتاه با تکرار اولین سطر پر می‌شوند
+    def last_window_rows(self, n):
+        rows = self.ends[:, None] - n + np.arange(n)[None, :]
+        return np.maximum(rows, self.starts[:, None])
+
+
+# بارگذاری جدول همراه با ساخت نمایه؛ جدول نامرتب یک بار در حافظه مرتب می‌شود
+def index_table(table):
+    index = TrajectoryIndex.build(table['unit'], table['cycle'])
+    if index.order is not None:
+        table = CmapssTable({name: index.sort(values) for name, values in table.columns.items()},
+                            table.digest, table.cache_path)
+        index.order = None
+    return table, index
+
+
+def load_indexed(path, member=None, **kwargs):
+    return index_table(load_table(path, member, **kwargs))
+
+
+def load_indexed_subset(kind, subset, **kwargs):
+    return index_table(load_subset(kind, subset, **kwargs))
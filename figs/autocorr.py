@@ -0,0 +1,210 @@
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import stats
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+# تعداد لگ پیش‌فرض مانند statsmodels: min(⌈10·log10(n)⌉, n//2)
+def default_nlags(nobs):
+    return min(int(np.ceil(10 * np.log10(nobs))), nobs // 2)
+
+
+# مجموع حاصل‌ضرب‌های تأخیری Σ x[t]·x[t+k] برای k = 0..nlags و همه ستون‌ها با FFT
+# طول FFT حداقل n+nlags است تا همپوشانی دایره‌ای در لگ‌های مورد نیاز رخ ندهد
+def lagged_products(values, nlags):
+    values = _as_2d(values)
+    n = len(values)
+    if n == 0:
+        return np.zeros((nlags + 1, values.shape[1]))
+    nfft = sp_fft.next_fast_len(n + nlags, real=True)
+    # FFT روی محور زمانِ پیوسته در حافظه (هر کانال یک سطر) سریع‌تر است
+    spectrum = sp_fft.rfft(np.ascontiguousarray(values.T), n=nfft, axis=1)
+    power = np.abs(spectrum)
+    power *= power
+    out = sp_fft.irfft(power, n=nfft, axis=1)[:, :nlags + 1].T.copy()
+    if nlags >= n:
+        out[n:] = 0.0
+    return out
+
+
+# باند اطمینان ACF مانند statsmodels (فرمول Bartlett یا ±z/√n)؛ خروجی (لگ، ستون، [پایین، بالا])
+def acf_confint(acf_values, nobs, alpha=0.05, bartlett_confint=True):
+    acf_values = np.asarray(acf_values, dtype=np.float64)
+    varacf = np.full_like(acf_values, 1.0 / nobs)
+    varacf[0] = 0
+    if bartlett_confint and len(acf_values) > 2:
+        varacf[2:] *= 1 + 2 * np.cumsum(acf_values[1:-1] ** 2, axis=0)
+    interval = stats.norm.ppf(1 - alpha / 2.0) * np.sqrt(varacf)
+    return np.stack([acf_values - interval, acf_values + interval], axis=-1)
+
+
+def _result(acf_values, confint, one_d):
+    if one_d:
+        acf_values = acf_values[:, 0]
+        confint = None if confint is None else confint[:, 0]
+    return acf_values, confint
+
+
+# خودهمبستگی همه ستون‌های یک آرایه (زمان × کانال) با FFT، هزینه O(n log n) برای هر کانال
+# مانند statsmodels.tsa.stattools.acf (demean=True، adjusted=False)؛ خروجی (acf، confint)
+# با شکل (nlags+1، کانال) و (nlags+1، کانال، 2)، یا برای ورودی یک‌بعدی مانند statsmodels
+# NaNها پس از کم کردن میانگین صفر در نظر گرفته می‌شوند
+def acf(values, nlags=None, alpha=0.05, bartlett_confint=True):
+    one_d = np.ndim(values) == 1
+    values = _as_2d(values)
+    nobs = len(values)
+    nlags = default_nlags(nobs) if nlags is None else nlags
+    mean = values.mean(axis=0)
+    if np.isnan(mean).any():
+        mean = np.nanmean(values, axis=0)
+        centered = np.nan_to_num(values - mean)
+    else:
+        centered = values - mean
+    acov = lagged_products(centered, nlags)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        acf_values = acov / acov[0]
+    confint = None if alpha is None else acf_confint(acf_values, nobs, alpha, bartlett_confint)
+    return _result(acf_values, confint, one_d)
+
+
+# خودهمبستگی جزئی از روی ACF با بازگشت Levinson-Durbin (برای همه ستون‌ها هم‌زمان)
+# معادل روش 'ywm' در statsmodels (Yule-Walker با مخرج n)
+def pacf_from_acf(acf_values, nlags=None):
+    r = _as_2d(acf_values)
+    nlags = len(r) - 1 if nlags is None else nlags
+    out = np.zeros((nlags + 1, r.shape[1]))
+    out[0] = 1.0
+    if nlags == 0:
+        return out
+    phi = np.zeros((nlags + 1, r.shape[1]))
+    phi[1] = out[1] = r[1]
+    error = 1 - r[1] ** 2
+    for k in range(2, nlags + 1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reflection = (r[k] - (phi[1:k] * r[k - 1:0:-1]).sum(axis=0)) / error
+        phi[1:k] = phi[1:k] - reflection * phi[k - 1:0:-1]
+        phi[k] = out[k] = reflection
+        error = error * (1 - reflection ** 2)
+    return out
+
+
+# خودهمبستگی جزئی همه ستون‌ها؛ باند اطمینان ±z/√n مانند statsmodels
+# method: 'ywm' (مخرج n، پیش‌فرض plot_pacf) یا 'ywadjusted' (مخرج n-k، پیش‌فرض تابع pacf در statsmodels)
+def pacf(values, nlags=None, alpha=0.05, method='ywm'):
+    if method not in ('ywm', 'ywadjusted'):
+        raise ValueError(f'unsupported pacf method: {method!r}')
+    one_d = np.ndim(values) == 1
+    values = _as_2d(values)
+    nobs = len(values)
+    nlags = min(default_nlags(nobs), nobs // 2 - 1) if nlags is None else nlags
+    acf_values = acf(values, nlags, alpha=None)[0]
+    if method == 'ywadjusted':
+        acf_values = acf_values * (nobs / (nobs - np.arange(nlags + 1)))[:, None]
+    pacf_values = pacf_from_acf(acf_values, nlags)
+    confint = None
+    if alpha is not None:
+        interval = stats.norm.ppf(1 - alpha / 2.0) / np.sqrt(nobs)
+        confint = np.stack([pacf_values - interval, pacf_values + interval], axis=-1)
+        confint[0] = pacf_values[0, :, None]
+    return _result(pacf_values, confint, one_d)
+
+
+class AcfAccumulator:
+    # محاسبه ACF روی تاریخچه‌ای که به صورت تکه‌های زمانی پیاپی می‌رسد، بدون نگه داشتن کل داده
+    # برای هر لگ مجموع حاصل‌ضرب‌های تأخیری جمع می‌شود؛ nlags سطر آخر هر تکه برای جفت‌هایی که از
+    # مرز تکه‌ها می‌گذرند و nlags سطر اول کل سری برای تصحیح میانگین نگه داشته می‌شود.
+    # داده‌ها با میانگین تکه اول جابه‌جا می‌شوند تا خطای گرد کردن در حاصل‌ضرب‌های خام کم شود
+    def __init__(self, nlags):
+        self.nlags = nlags
+        self.nobs = 0
+        self.shift = None
+        self.total = None
+        self.products = None
+        self._head = None
+        self._tail = None
+
+    def update(self, chunk):
+        chunk = _as_2d(chunk)
+        if not len(chunk):
+            return self
+        if self.shift is None:
+            self.shift = np.nan_to_num(np.nanmean(chunk, axis=0))
+            width = chunk.shape[1]
+            self.total = np.zeros(width)
+            self.products = np.zeros((self.nlags + 1, width))
+            self._head = np.zeros((0, width))
+            self._tail = np.zeros((0, width))
+        x = chunk - self.shift
+        x[np.isnan(x)] = 0.0
+        data = np.vstack([self._tail, x])
+        # جفت‌هایی که هر دو عضوشان در دنباله تکه قبلی‌اند قبلاً شمرده شده‌اند
+        self.products += lagged_products(data, self.nlags) - lagged_products(self._tail, self.nlags)
+        self.total += x.sum(axis=0)
+        self.nobs += len(x)
+        if len(self._head) < self.nlags:
+            self._head = np.vstack([self._head, x[:self.nlags - len(self._head)]])
+        self._tail = data[-self.nlags:] if self.nlags else data[:0]
+        return self
+
+    # خودکوواریانس (مخرج n) از مجموع‌های انباشته:
+    # Σ(x[t]-m)(x[t+k]-m) = S_k - m·(A_k + B_k) + (n-k)·m²
+    # A_k مجموع همه به جز k نمونه آخر و B_k مجموع همه به جز k نمونه اول است
+    def acovf(self):
+        n = self.nobs
+        k = np.arange(self.nlags + 1)
+        zero = np.zeros((1, len(self.total)))
+        head = np.vstack([zero, np.cumsum(self._head, axis=0)])
+        tail = np.vstack([zero, np.cumsum(self._tail[::-1], axis=0)])
+        first_k = head[np.minimum(k, len(head) - 1)]
+        last_k = tail[np.minimum(k, len(tail) - 1)]
+        mean = self.total / n
+        acov = (self.products - mean * (2 * self.total - first_k - last_k) + (n - k[:, None]) * mean ** 2) / n
+        acov[k >= n] = 0.0
+        return acov
+
+    def acf(self, alpha=0.05, bartlett_confint=True):
+        acov = self.acovf()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acf_values = acov / acov[0]
+        confint = None if alpha is None else acf_confint(acf_values, self.nobs, alpha, bartlett_confint)
+        return acf_values, confint
+
+    def pacf(self, alpha=0.05):
+        pacf_values = pacf_from_acf(self.acf(alpha=None)[0])
+        confint = None
+        if alpha is not None:
+            interval = stats.norm.ppf(1 - alpha / 2.0) / np.sqrt(self.nobs)
+            confint = np.stack([pacf_values - interval, pacf_values + interval], axis=-1)
+            confint[0] = pacf_values[0, :, None]
+        return pacf_values, confint
+
+
+# رسم ACF/PACF یک کانال با همان ظاهر plot_acf/plot_pacf در statsmodels (خطوط عمودی، نشانگرها و باند اطمینان)
+# kwargs مانند statsmodels به ax.plot و ax.axhline داده می‌شود
+def plot_corr(ax, values, confint=None, title='Autocorrelation', lags=None, vlines_kwargs=None,
+              skip_lag0_confint=True, **kwargs):
+    values = np.asarray(values)
+    lags = np.arange(len(values)) if lags is None else np.asarray(lags)
+    ax.vlines(lags, [0], values, **(vlines_kwargs or {}))
+    ax.axhline(**kwargs)
+    kwargs.setdefault('marker', 'o')
+    kwargs.setdefault('markersize', 5)
+    if 'ls' not in kwargs:
+        kwargs.setdefault('linestyle', 'None')
+    ax.margins(0.05)
+    ax.plot(lags, values, **kwargs)
+    ax.set_title(title)
+    ax.set_ylim(-1, 1)
+    if confint is not None:
+        confint = np.asarray(confint)
+        if skip_lag0_confint and lags[0] == 0:
+            lags, values, confint = lags[1:], values[1:], confint[1:]
+        lags = lags.astype(float)
+        lags[np.argmin(lags)] -= 0.5
+        lags[np.argmax(lags)] += 0.5
+        ax.fill_between(lags, confint[:, 0] - values, confint[:, 1] - values, alpha=0.25)
+    return ax
@@ -0,0 +1,22 @@
+import numpy as np
+
+# بیش از این تعداد نقطه، نقاط در خروجی برداری (PDF/SVG) به صورت تصویر ذخیره می‌شوند
+RASTER_THRESHOLD = 50000
+
+
+# رسم نقاط دسته‌بندی‌شده با یک مجموعه (PathCollection) برای هر دسته به جای یک artist برای هر نقطه
+# codes: شماره دسته هر نقطه (اندیس در categories)؛ categories: فهرست (برچسب، رنگ) به ترتیب راهنما
+# دسته‌های بدون نقطه رسم نمی‌شوند و در راهنما هم نمی‌آیند
+def scatter_by_category(ax, x, y, codes, categories, rasterized=None, **kwargs):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    codes = np.asarray(codes)
+    if rasterized is None:
+        rasterized = len(x) > RASTER_THRESHOLD
+    handles = []
+    for code, (label, color) in enumerate(categories):
+        mask = codes == code
+        if not mask.any():
+            continue
+        handles.append(ax.scatter(x[mask], y[mask], color=color, label=label, rasterized=rasterized, **kwargs))
+    return handles
@@ -0,0 +1,200 @@
+import numpy as np
+
+# آشکارسازهای جریانی تغییر برای تعداد زیادی کانال حسگر به طور هم‌زمان
+# وضعیت هر آشکارساز آرایه‌هایی به طول تعداد کانال‌هاست؛ update یک نمونه برای همه کانال‌ها
+# (آرایه‌ای به طول n_channels، NaN یعنی نمونه ناموجود) می‌گیرد و ماسک کانال‌های دارای تغییر را برمی‌گرداند
+# پارامترها می‌توانند عدد یا آرایه‌ای به طول n_channels (مقدار جداگانه برای هر کانال) باشند
+
+
+def _as_sample(x, n_channels):
+    x = np.asarray(x, dtype=np.float64).reshape(-1)
+    if len(x) != n_channels:
+        raise ValueError(f'expected {n_channels} channels, got {len(x)}')
+    return x, ~np.isnan(x)
+
+
+class Cusum:
+    # CUSUM دوطرفه (جدولی) روی داده استانداردشده؛ میانگین و انحراف معیار مرجع از warmup نمونه اول
+    # هر کانال (Welford) تخمین زده می‌شود. تغییر وقتی اعلام می‌شود که مجموع تجمعی انحراف‌های بیش از k
+    # (بر حسب انحراف معیار) از h بیشتر شود؛ سپس وضعیت آن کانال صفر و مرجع از داده‌های جدید دوباره یادگرفته می‌شود
+    def __init__(self, n_channels, k=0.5, h=5.0, warmup=50):
+        self.n_channels = n_channels
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.t = 0
+        self.count = np.zeros(n_channels)
+        self.mean = np.zeros(n_channels)
+        self.m2 = np.zeros(n_channels)
+        self.g_pos = np.zeros(n_channels)
+        self.g_neg = np.zeros(n_channels)
+        # جهت آخرین تغییر هر کانال: +1 افزایش، -1 کاهش
+        self.direction = np.zeros(n_channels, dtype=np.int8)
+
+    def update(self, x):
+        x, valid = _as_sample(x, self.n_channels)
+        learning = valid & (self.count < self.warmup)
+        count = self.count + learning
+        delta = np.where(learning, x - self.mean, 0.0)
+        self.mean += delta / np.maximum(count, 1)
+        self.m2 += delta * np.where(learning, x - self.mean, 0.0)
+        self.count = count
+
+        active = valid & ~learning
+        std = np.sqrt(self.m2 / np.maximum(self.count - 1, 1))
+        std[std < 1e-12] = 1.0
+        z = np.where(active, (x - self.mean) / std, 0.0)
+        self.g_pos = np.where(active, np.maximum(0.0, self.g_pos + z - self.k), self.g_pos)
+        self.g_neg = np.where(active, np.maximum(0.0, self.g_neg - z - self.k), self.g_neg)
+        up = self.g_pos > self.h
+        down = self.g_neg > self.h
+        change = up | down
+        self.direction = np.where(change, up.astype(np.int8) - down, self.direction)
+        self.reset(change)
+        self.t += 1
+        return change
+
+    def reset(self, mask=None):
+        mask = slice(None) if mask is None else mask
+        for state in (self.count, self.mean, self.m2, self.g_pos, self.g_neg):
+            state[mask] = 0.0
+
+
+class PageHinkley:
+    # آزمون Page-Hinkley دوطرفه: مجموع تجمعی انحراف از میانگین جاری (منهای تحمل delta) با کمینه/بیشینه
+    # تاریخی آن مقایسه می‌شود؛ threshold بر حسب واحد داده است. پیش از min_samples نمونه تغییری اعلام نمی‌شود
+    def __init__(self, n_channels, delta=0.005, threshold=50.0, min_samples=30):
+        self.n_channels = n_channels
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.t = 0
+        self.count = np.zeros(n_channels)
+        self.mean = np.zeros(n_channels)
+        self.cum_up = np.zeros(n_channels)
+        self.min_up = np.zeros(n_channels)
+        self.cum_down = np.zeros(n_channels)
+        self.max_down = np.zeros(n_channels)
+        self.direction = np.zeros(n_channels, dtype=np.int8)
+
+    def update(self, x):
+        x, valid = _as_sample(x, self.n_channels)
+        self.count += valid
+        self.mean += np.where(valid, x - self.mean, 0.0) / np.maximum(self.count, 1)
+        dev = np.where(valid, x - self.mean, 0.0)
+        self.cum_up += np.where(valid, dev - self.delta, 0.0)
+        self.cum_down += np.where(valid, dev + self.delta, 0.0)
+        np.minimum(self.min_up, self.cum_up, out=self.min_up)
+        np.maximum(self.max_down, self.cum_down, out=self.max_down)
+        ready = valid & (self.count >= self.min_samples)
+        up = ready & (self.cum_up - self.min_up > self.threshold)
+        down = ready & (self.max_down - self.cum_down > self.threshold)
+        change = up | down
+        self.direction = np.where(change, up.astype(np.int8) - down, self.direction)
+        self.reset(change)
+        self.t += 1
+        return change
+
+    def reset(self, mask=None):
+        mask = slice(None) if mask is None else mask
+        for state in (self.count, self.mean, self.cum_up, self.min_up, self.cum_down, self.max_down):
+            state[mask] = 0.0
+
+
+class AdaptiveWindow:
+    # نسخه ساده‌شده ADWIN با حافظه ثابت: نمونه‌های هر کانال در n_buckets سطل به اندازه bucket_size
+    # خلاصه می‌شوند (مجموع، مجموع مربعات، تعداد). با پر شدن هر سطل همه نقاط برش بین سطل‌ها آزموده می‌شوند
+    # و اگر اختلاف میانگین دو بخش پنجره از کران ADWIN بیشتر باشد، سطل‌های قدیمی‌تر از آخرین برش حذف می‌شوند.
+    # هزینه هر نمونه O(1) و هزینه بستن هر سطل O(n_buckets) است
+    def __init__(self, n_channels, delta=0.002, bucket_size=16, n_buckets=64):
+        self.n_channels = n_channels
+        self.delta = delta
+        self.bucket_size = bucket_size
+        self.n_buckets = n_buckets
+        self.t = 0
+        # سطل‌ها از قدیمی (ستون 0) به جدید (ستون آخر) مرتب‌اند
+        self.sums = np.zeros((n_channels, n_buckets))
+        self.squares = np.zeros((n_channels, n_buckets))
+        self.counts = np.zeros((n_channels, n_buckets))
+        self._sum = np.zeros(n_channels)
+        self._square = np.zeros(n_channels)
+        self._count = np.zeros(n_channels)
+        self._splits = np.arange(n_buckets - 1)
+
+    @property
+    def width(self):
+        return self.counts.sum(axis=1) + self._count
+
+    @property
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.sums.sum(axis=1) + self._sum) / self.width
+
+    def update(self, x):
+        x, valid = _as_sample(x, self.n_channels)
+        value = np.where(valid, x, 0.0)
+        self._sum += value
+        self._square += value ** 2
+        self._count += valid
+        change = np.zeros(self.n_channels, dtype=bool)
+        full = np.flatnonzero(self._count >= self.bucket_size)
+        if len(full):
+            change[full] = self._close(full)
+        self.t += 1
+        return change
+
+    def _close(self, rows):
+        for state, current in ((self.sums, self._sum), (self.squares, self._square), (self.counts, self._count)):
+            state[rows, :-1] = state[rows, 1:]
+            state[rows, -1] = current[rows]
+            current[rows] = 0.0
+        s, q, n = self.sums[rows], self.squares[rows], self.counts[rows]
+        n_total = n.sum(axis=1, keepdims=True)
+        s_total = s.sum(axis=1, keepdims=True)
+        # بخش قدیمی: سطل‌های 0..i، بخش جدید: بقیه
+        n0 = np.cumsum(n, axis=1)[:, :-1]
+        s0 = np.cumsum(s, axis=1)[:, :-1]
+        n1 = n_total - n0
+        s1 = s_total - s0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = np.maximum(q.sum(axis=1, keepdims=True) / n_total - (s_total / n_total) ** 2, 0.0)
+            m = 1.0 / (1.0 / n0 + 1.0 / n1)
+            log_term = np.log(2.0 * np.log(np.maximum(n_total, 3.0)) / self.delta)
+            eps = np.sqrt(2.0 / m * var * log_term) + 2.0 / (3.0 * m) * log_term
+            cut = (n0 > 0) & (n1 > 0) & (np.abs(s0 / n0 - s1 / n1) > eps)
+        changed = cut.any(axis=1)
+        if changed.any():
+            # حذف سطل‌های قدیمی‌تر از جدیدترین برش معنادار
+            last = np.where(cut, self._splits, -1).max(axis=1)
+            drop = self._splits[None, :] <= last[:, None]
+            for state in (self.sums, self.squares, self.counts):
+                block = state[rows]
+                block[:, :-1][drop] = 0.0
+                state[rows] = block
+        return changed
+
+
+# اجرای یک آشکارساز روی آرایه (زمان × کانال)؛ خروجی (زمان‌ها، کانال‌ها) نقاط تغییر
+# زمان‌ها بر اساس شمارنده آشکارساز است، پس فراخوانی پشت‌سرهم روی تکه‌های پیاپی یک جریان درست کار می‌کند
+def detect(detector, values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    times, channels = [], []
+    for row in values:
+        t = detector.t
+        hit = np.flatnonzero(detector.update(row))
+        if len(hit):
+            times.append(np.full(len(hit), t))
+            channels.append(hit)
+    if not times:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(times), np.concatenate(channels)
+
+
+# رسم نقاط تغییر روی یک نمودار سری زمانی موجود با یک مجموعه خط عمودی
+# x: محور زمان همان نمودار؛ times: اندیس نمونه‌ها (خروجی detect)
+def overlay_changes(ax, x, times, color='red', linestyle='--', alpha=0.7, **kwargs):
+    positions = np.asarray(x)[np.asarray(times, dtype=np.int64)]
+    return ax.vlines(positions, 0, 1, transform=ax.get_xaxis_transform(),
+                     colors=color, linestyles=linestyle, alpha=alpha, **kwargs)
@@ -0,0 +1,226 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from streaming_pca import StreamingPCA, iter_chunks
+
+METHODS = ('pearson', 'spearman')
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+class CorrelationAccumulator:
+    # ماتریس همبستگی/کوواریانس هزاران ستون روی داده‌ای که تکه‌تکه می‌رسد (مثلاً کل تاریخچه historian)
+    # برای هر جفت ستون (i, j) روی سطرهایی که هر دو مقدار دارند (حذف جفتی NaN مانند pandas.DataFrame.corr)
+    # تعداد، میانگین، مجموع مربعات انحراف و هم‌گشتاور نگه داشته و بین تکه‌ها با فرمول Chan ادغام می‌شود؛
+    # هر تکه پیش از ضرب‌های ماتریسی با میانگین ستون‌های خودش جابه‌جا می‌شود تا خطای گرد کردن کم بماند.
+    # با merge نتایج جزئی کارگرهای موازی (بخش‌های مختلف داده) ترکیب می‌شوند
+    # حافظه چهار ماتریس (ستون × ستون) است و به تعداد سطرها بستگی ندارد
+    def __init__(self, n_columns):
+        self.n_columns = n_columns
+        shape = (n_columns, n_columns)
+        self.count = np.zeros(shape)
+        # mean[i, j] و m2[i, j]: میانگین و مجموع مربعات انحراف ستون i روی سطرهای مشترک با ستون j
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.comoment = np.zeros(shape)
+
+    @classmethod
+    def from_chunks(cls, chunks, n_columns=None):
+        acc = None
+        for chunk in chunks:
+            chunk = _as_2d(chunk)
+            if acc is None:
+                acc = cls(n_columns or chunk.shape[1])
+            acc.update(chunk)
+        return acc if acc is not None else cls(n_columns or 0)
+
+    def _combine(self, count, mean, m2, comoment):
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, count / total, 0.0)
+        delta = mean - self.mean
+        cross = self.count * weight
+        self.comoment += comoment + delta * delta.T * cross
+        self.m2 += m2 + delta ** 2 * cross
+        self.mean += delta * weight
+        self.count = total
+        return self
+
+    def update(self, chunk):
+        chunk = _as_2d(chunk)
+        if not len(chunk):
+            return self
+        valid = ~np.isnan(chunk)
+        with np.errstate(invalid='ignore'):
+            shift = np.nan_to_num(np.nanmean(chunk, axis=0))
+        x = np.where(valid, chunk - shift, 0.0)
+        if valid.all():
+            # بدون NaN همه جفت‌ها سطرهای یکسان دارند: تعداد، میانگین و m2 بردار ستونی (ستون × 1) می‌مانند،
+            # در _combine روی ستون‌ها پخش می‌شوند و فقط ضرب xᵀx ماتریسی است
+            n = float(len(chunk))
+            sums = x.sum(axis=0)[:, None]
+            local = sums / n
+            m2 = (x ** 2).sum(axis=0)[:, None] - sums * local
+            return self._combine(n, local + shift[:, None], m2, x.T @ x - sums * local.T)
+        m = valid.astype(np.float64)
+        count = m.T @ m
+        sums = x.T @ m
+        with np.errstate(invalid='ignore', divide='ignore'):
+            local = np.where(count > 0, sums / count, 0.0)
+        m2 = (x ** 2).T @ m - sums * local
+        comoment = x.T @ x - sums * local.T
+        return self._combine(count, local + shift[:, None], m2, comoment)
+
+    def merge(self, other):
+        return self._combine(other.count, other.mean, other.m2, other.comoment)
+
+    def covariance(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.comoment / (self.count - ddof)
+
+    def correlation(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        np.fill_diagonal(corr, np.where(np.diag(self.m2) > 0, 1.0, np.nan))
+        return corr
+
+    # مدل PCA روی همان آمار انباشته (برای داده بدون NaN هم‌ارز برازش StreamingPCA روی همان تکه‌ها)
+    def pca(self, n_components=None):
+        model = StreamingPCA(n_components)
+        model.n_samples_seen_ = float(np.diag(self.count).max(initial=0.0))
+        model.mean_ = np.diag(self.mean).copy()
+        model.scatter = self.comoment.copy()
+        return model
+
+
+class ColumnRanker:
+    # تبدیل مقادیر هر ستون به رتبه نسبی (تابع توزیع تجربی با رتبه میانی برای مقادیر برابر) بر اساس نمونه‌ای
+    # از سطرها؛ همبستگی Pearson روی رتبه‌ها همان Spearman است، پس با این تبدیل Spearman هم جریانی می‌شود.
+    # وقتی نمونه کل داده باشد رتبه‌ها دقیق‌اند و در غیر این صورت تقریبی با خطای از مرتبه 1/√اندازه نمونه.
+    # رتبه هر ستون مستقل از بقیه است؛ با NaN، Spearman حاصل (با حذف جفتی در CorrelationAccumulator) فقط
+    # تقریبی از Spearman جفتی است که هر جفت را روی سطرهای مشترکش رتبه‌بندی می‌کند
+    # presorted: ستون‌های sample از قبل مرتب‌اند (NaNها در انتها، مانند np.sort)، مثلاً memmap فایل save
+    def __init__(self, sample, presorted=False):
+        sample = sample if presorted else _as_2d(sample)
+        self.sorted = sample if presorted else np.sort(sample, axis=0)
+        self.valid = (~np.isnan(self.sorted)).sum(axis=0)
+
+    # نمونه مرتب‌شده در فایل .npy تا کارگرها به جای کپی و مرتب‌سازی دوباره آن را با memmap باز کنند
+    def save(self, path):
+        np.save(path, self.sorted)
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(path, mmap_mode='r'), presorted=True)
+
+    def transform(self, chunk):
+        chunk = _as_2d(chunk)
+        ranks = np.full(chunk.shape, np.nan)
+        for j in range(chunk.shape[1]):
+            column = self.sorted[:self.valid[j], j]
+            valid = ~np.isnan(chunk[:, j])
+            values = chunk[valid, j]
+            left = np.searchsorted(column, values, side='left')
+            right = np.searchsorted(column, values, side='right')
+            ranks[valid, j] = (left + right) / (2.0 * max(self.valid[j], 1))
+        return ranks
+
+
+# رتبه میانی مقادیر هر ستون فقط روی سطرهای mask (سطرها به ترتیب مرتب‌شده هر ستون)
+# first/last: ابتدا و انتهای گروه مقادیر برابر هر جایگاه در همان ترتیب
+def _masked_ranks(mask, first, last):
+    counts = np.zeros((len(mask) + 1, mask.shape[1]))
+    np.cumsum(mask, axis=0, out=counts[1:])
+    before = np.take_along_axis(counts, first, axis=0)
+    within = np.take_along_axis(counts, last + 1, axis=0) - before
+    return before + (within + 1) / 2
+
+
+# Spearman جفتی دقیق برای ستون‌های دارای NaN (مانند pandas): هر جفت روی سطرهای مشترک خودش دوباره رتبه‌بندی
+# می‌شود. هر ستون یک بار مرتب می‌شود و برای هر ستون دارای NaN، رتبه‌های محدود به سطرهای مشترک با همه ستون‌های
+# دیگر با جمع تجمعی روی همان ترتیب‌ها (بدون مرتب‌سازی دوباره) به دست می‌آید؛ جفت‌های دو ستون کامل دست نمی‌خورند
+def _pairwise_spearman(values, corr):
+    n, d = values.shape
+    order = np.argsort(values, axis=0, kind='stable')
+    ordered = np.take_along_axis(values, order, axis=0)
+    valid = ~np.isnan(values)
+    position = np.arange(n)[:, None]
+    starts = np.vstack([np.ones((1, d), dtype=bool), ordered[1:] != ordered[:-1]])
+    ends = np.vstack([starts[1:], np.ones((1, d), dtype=bool)])
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=0)
+    last = np.minimum.accumulate(np.where(ends, position, n - 1)[::-1], axis=0)[::-1]
+    for i in np.flatnonzero(~valid.all(axis=0)):
+        shared = valid[:, i:i + 1] & valid
+        count = shared.sum(axis=0)
+        # رتبه هر ستون روی سطرهای مشترک با i و رتبه ستون i روی سطرهای مشترک با هر ستون، به ترتیب اصلی سطرها
+        other = np.empty((n, d))
+        np.put_along_axis(other, order, _masked_ranks(np.take_along_axis(shared, order, axis=0), first, last),
+                          axis=0)
+        own = np.empty((n, d))
+        own[order[:, i]] = _masked_ranks(shared[order[:, i]], first[:, [i]], last[:, [i]])
+        center = (count + 1) / 2
+        x = np.where(shared, own - center, 0.0)
+        y = np.where(shared, other - center, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (x * y).sum(axis=0) / np.sqrt((x ** 2).sum(axis=0) * (y ** 2).sum(axis=0))
+        r[count < 2] = np.nan
+        r[i] = corr[i, i]
+        corr[i, :] = corr[:, i] = r
+    return corr
+
+
+# همبستگی یکجای آرایه درون حافظه؛ spearman با رتبه‌های دقیق هر ستون و برای جفت‌های دارای NaN با رتبه‌بندی
+# دوباره روی سطرهای مشترک هر جفت، پس نتیجه همان DataFrame.corr('spearman') است
+def correlation(values, method='pearson', rows=4096):
+    if method not in METHODS:
+        raise ValueError(f'unknown correlation method: {method!r}')
+    values = _as_2d(values)
+    if method == 'pearson':
+        return CorrelationAccumulator.from_chunks(iter_chunks(values, rows), values.shape[1]).correlation()
+    ranks = stats.rankdata(values, axis=0, nan_policy='omit')
+    corr = CorrelationAccumulator.from_chunks(iter_chunks(ranks, rows), values.shape[1]).correlation()
+    return _pairwise_spearman(values, corr) if np.isnan(values).any() else corr
+
+
+def _shard(path, lo, hi, rows, ranks_path):
+    data = np.load(path, mmap_mode='r')[lo:hi]
+    chunks = iter_chunks(data, rows)
+    if ranks_path is not None:
+        ranker = ColumnRanker.load(ranks_path)
+        chunks = (ranker.transform(chunk) for chunk in chunks)
+    return CorrelationAccumulator.from_chunks(chunks, data.shape[1])
+
+
+# همبستگی کل یک فایل .npy بزرگ (سطر = زمان) با کارگرهای موازی: هر کارگر یک بازه سطری را با memmap
+# می‌خواند و آمار جزئی برمی‌گرداند که در فرایند اصلی ادغام می‌شوند
+# spearman: رتبه‌ها از sample_size سطر تصادفی فایل تخمین زده می‌شوند (برای فایل‌های کوچک‌تر دقیق)؛
+# با NaN هر ستون یک بار روی همه مقادیر معتبرش رتبه می‌گیرد و سپس حذف جفتی انجام می‌شود، پس نتیجه فقط
+# تقریبی از Spearman جفتی pandas است (برخلاف correlation که جفت‌ها را دوباره رتبه‌بندی می‌کند)
+# نمونه یک بار در فرایند اصلی مرتب و در یک فایل موقت ذخیره می‌شود و کارگرها فقط مسیر آن را می‌گیرند
+def correlation_from_file(path, method='pearson', workers=None, rows=4096, sample_size=20000, seed=42):
+    if method not in METHODS:
+        raise ValueError(f'unknown correlation method: {method!r}')
+    data = np.load(path, mmap_mode='r')
+    n = len(data)
+    workers = workers or os.cpu_count() or 1
+    bounds = np.linspace(0, n, min(workers, max(n, 1)) + 1).astype(int)
+    total = CorrelationAccumulator(data.shape[1])
+    with tempfile.TemporaryDirectory(prefix='.ranks-') as work_dir:
+        ranks_path = None
+        if method == 'spearman':
+            picked = np.sort(np.random.default_rng(seed).choice(n, size=min(sample_size, n), replace=False))
+            ranks_path = os.path.join(work_dir, 'sample.npy')
+            ColumnRanker(data[picked]).save(ranks_path)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_shard, path, lo, hi, rows, ranks_path)
+                    for lo, hi in zip(bounds[:-1], bounds[1:])]
+            for job in jobs:
+                total.merge(job.result())
+    return total.correlation()
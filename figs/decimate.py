@@ -0,0 +1,78 @@
+import numpy as np
+
+# نقاط هر ستون پیکسل در روش M4: اولین، آخرین، کمینه و بیشینه
+POINTS_PER_COLUMN = 4
+
+
+# تعداد ستون‌های پیکسل محور در خروجی نهایی (dpi همان مقداری است که به savefig داده می‌شود)
+def pixel_columns(ax, dpi=None):
+    fig = ax.get_figure()
+    return max(1, int(np.ceil(ax.get_position().width * fig.get_figwidth() * (dpi or fig.dpi))))
+
+
+# تبدیل محور x (عدد، datetime64 یا pandas) به آرایه عددی برای تقسیم به ستون‌ها
+def _numeric(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64) or np.issubdtype(x.dtype, np.timedelta64):
+        return x.view(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+# اندیس نقاطی که در روش M4 باقی می‌مانند؛ x باید صعودی باشد
+# هر ستون پیکسل: اولین و آخرین نقطه و نقاط کمینه و بیشینه (NaNها نادیده گرفته می‌شوند)
+# keep: ماسک یا اندیس نقاطی که همیشه حفظ می‌شوند (مثلاً نقاط پرت)
+def m4_indices(x, y, n_columns, keep=None):
+    xn = _numeric(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(xn)
+    if n == 0:
+        return np.arange(0)
+    span = xn[-1] - xn[0]
+    if span > 0:
+        col = np.minimum(((xn - xn[0]) / span * n_columns).astype(np.int64), n_columns - 1)
+    else:
+        col = np.zeros(n, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, col[1:] != col[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    pos = np.arange(n)
+    with np.errstate(invalid='ignore'):
+        y_min = np.fmin.reduceat(y, starts)
+        y_max = np.fmax.reduceat(y, starts)
+        i_min = np.minimum.reduceat(np.where(y == y_min[seg], pos, n), starts)
+        i_max = np.minimum.reduceat(np.where(y == y_max[seg], pos, n), starts)
+    parts = [starts, ends, i_min[i_min < n], i_max[i_max < n]]
+    if keep is not None:
+        keep = np.asarray(keep)
+        parts.append(np.flatnonzero(keep) if keep.dtype == bool else keep.astype(np.int64))
+    return np.unique(np.concatenate(parts))
+
+
+# اندیس نقاط قابل رسم؛ سری‌های کوتاه یا غیرصعودی بدون تغییر رسم می‌شوند
+def decimate(ax, x, y, keep=None, n_columns=None, dpi=None):
+    n = len(x)
+    n_columns = n_columns or pixel_columns(ax, dpi)
+    if n <= POINTS_PER_COLUMN * n_columns:
+        return slice(None)
+    xn = _numeric(x)
+    if np.any(np.diff(xn) < 0):
+        return slice(None)
+    return m4_indices(xn, y, n_columns, keep)
+
+
+def _take(values, idx):
+    return values.iloc[idx] if hasattr(values, 'iloc') else np.asarray(values)[idx]
+
+
+# رسم خطی یک سری طولانی با پوش کمینه/بیشینه هر ستون پیکسل؛ هزینه رسم به عرض شکل بستگی دارد نه طول سری
+def decimated_plot(ax, x, y, keep=None, n_columns=None, dpi=None, **kwargs):
+    idx = decimate(ax, x, y, keep, n_columns, dpi)
+    return ax.plot(_take(x, idx), _take(y, idx), **kwargs)
+
+
+# نمودار پراکندگی با همان کاهش نقاط؛ c اگر آرایه‌ای هم‌طول داده‌ها باشد همراه نقاط کاهش می‌یابد
+def decimated_scatter(ax, x, y, keep=None, n_columns=None, dpi=None, c=None, **kwargs):
+    idx = decimate(ax, x, y, keep, n_columns, dpi)
+    if c is not None and not isinstance(c, str) and np.ndim(c) > 0 and len(c) == len(x):
+        c = _take(c, idx)
+    return ax.scatter(_take(x, idx), _take(y, idx), c=c, **kwargs)
@@ -0,0 +1,185 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from scipy import optimize
+
+METHODS = ('minres', 'principal')
+ROTATIONS = (None, 'varimax')
+
+# کمینه مقدار ویژه مثبت در تابع هدف minres (همان ترفند تابع fac در بسته psych)
+_EIG_FLOOR = np.finfo(float).eps * 100
+
+# بارهای عاملی محاسبه‌شده برای هر (ماتریس همبستگی، تعداد عامل، روش، چرخش، کران‌ها)؛
+# LRU با حداکثر _CACHE_SIZE درایه تا حافظه در پردازش‌های طولانی بی‌حد رشد نکند
+_CACHE_SIZE = 128
+_cache = OrderedDict()
+
+
+# تبدیل ماتریس کوواریانس (مثلاً خروجی StreamingPCA.covariance_) به ماتریس همبستگی
+def covariance_to_correlation(cov):
+    cov = np.asarray(cov, dtype=np.float64)
+    scale = 1.0 / np.sqrt(np.diag(cov))
+    corr = cov * scale[:, None] * scale[None, :]
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+# مجذور همبستگی چندگانه هر متغیر با بقیه (R² رگرسیون روی سایر متغیرها)
+def smc(corr):
+    return 1 - 1 / np.diag(np.linalg.inv(corr))
+
+
+# چرخش varimax با نرمال‌سازی Kaiser (همان الگوریتم factor_analyzer و تابع varimax در R)
+# هر تکرار فقط ضرب ماتریسی و یک SVD کوچک (عامل × عامل) است؛ خروجی (بارهای چرخیده، ماتریس چرخش)
+def varimax(loadings, normalize=True, max_iter=500, tol=1e-5):
+    X = np.asarray(loadings, dtype=np.float64)
+    n_rows, n_cols = X.shape
+    if n_cols < 2:
+        return X.copy(), np.eye(n_cols)
+    if normalize:
+        norms = np.sqrt((X ** 2).sum(axis=1))
+        X = X / norms[:, None]
+    rotation = np.eye(n_cols)
+    d = 0
+    for _ in range(max_iter):
+        old_d = d
+        basis = X @ rotation
+        transformed = X.T @ (basis ** 3 - basis * ((basis ** 2).sum(axis=0) / n_rows))
+        U, S, Vt = np.linalg.svd(transformed)
+        rotation = U @ Vt
+        d = S.sum()
+        if d < old_d * (1 + tol):
+            break
+    X = X @ rotation
+    if normalize:
+        X = X * norms[:, None]
+    return X, rotation
+
+
+def _top_loadings(values, vectors, n_factors):
+    # مقادیر ویژه صعودی eigh ← n_factors بزرگ‌ترین، نزولی
+    values = values[::-1][:n_factors]
+    vectors = vectors[:, ::-1][:, :n_factors]
+    return vectors * np.sqrt(np.maximum(values, 0.0))
+
+
+# تابع هدف minres (مجموع مربعات باقیمانده خارج از مدل عاملی) و گرادیان تحلیلی آن نسبت به یکتایی‌ها
+# اگر R(ψ) = R با قطر 1-ψ و λ₁..λₖ بزرگ‌ترین مقادیر ویژه باشند، هدف Σ_{j>k} λⱼ² است و
+# ∂λⱼ/∂ψᵢ = -vᵢⱼ²؛ با گرادیان تحلیلی L-BFGS-B به جای d+1 تجزیه در هر گام فقط یک تجزیه نیاز دارد
+def _minres_objective(psi, corr, n_factors):
+    reduced = corr.copy()
+    np.fill_diagonal(reduced, 1 - psi)
+    values, vectors = np.linalg.eigh(reduced)
+    top = np.maximum(values[::-1][:n_factors], _EIG_FLOOR)
+    top_vectors = vectors[:, ::-1][:, :n_factors]
+    residual = reduced - (top_vectors * top) @ top_vectors.T
+    rest = vectors[:, :-n_factors] * values[:-n_factors]
+    # سهم مقادیر ویژه بریده‌شده (کمتر از کف) در گرادیان با همان کف محاسبه می‌شود
+    clipped = (top - values[::-1][:n_factors]) * top_vectors
+    grad = -2 * ((rest * vectors[:, :-n_factors]).sum(axis=1) - (clipped * top_vectors).sum(axis=1))
+    return (residual ** 2).sum(), grad
+
+
+def _minres_loadings(corr, n_factors, start, bounds):
+    res = optimize.minimize(_minres_objective, start, args=(corr, n_factors), jac=True, method='L-BFGS-B',
+                            bounds=None if bounds is None else [bounds] * len(corr),
+                            options={'maxiter': 1000})
+    reduced = corr.copy()
+    np.fill_diagonal(reduced, 1 - res.x)
+    values, vectors = np.linalg.eigh(reduced)
+    return _top_loadings(values, vectors, n_factors)
+
+
+# هم‌علامت کردن هر عامل با جمع ستون آن (مانند R) و مرتب‌سازی عوامل بر اساس واریانس توضیح‌داده‌شده
+def _orient(loadings, method):
+    if loadings.shape[1] > 1:
+        signs = np.sign(loadings.sum(axis=0))
+        signs[signs == 0] = 1
+        loadings = loadings * signs
+    if method != 'principal':
+        loadings = loadings[:, np.argsort((loadings ** 2).sum(axis=0))[::-1]]
+    return loadings
+
+
+def _corr_key(corr):
+    return hashlib.sha1(np.ascontiguousarray(corr).tobytes()).hexdigest()
+
+
+class CorrelationDecomposition:
+    # همه چیزهایی که برای برازش با هر تعداد عامل از یک ماتریس همبستگی لازم است یک بار محاسبه می‌شود:
+    # تجزیه ویژه ماتریس همبستگی (مقادیر ویژه برای نمودار اسکری/معیار Kaiser و بارهای روش principal
+    # برای هر k) و SMC (نقطه شروع minres)
+    def __init__(self, corr):
+        self.corr = np.asarray(corr, dtype=np.float64)
+        self.key = _corr_key(self.corr)
+        values, vectors = np.linalg.eigh(self.corr)
+        self._values = values
+        self._vectors = vectors
+        self.eigenvalues = values[::-1]
+        self.smc = smc(self.corr)
+
+    # تعداد عامل پیشنهادی با معیار Kaiser (مقادیر ویژه بزرگ‌تر از یک)
+    @property
+    def kaiser(self):
+        return int((self.eigenvalues > 1).sum())
+
+    def loadings(self, n_factors, method='minres', rotation='varimax', bounds=(0.005, 1), use_smc=True):
+        if method not in METHODS:
+            raise ValueError(f'unknown factor extraction method: {method!r}')
+        if rotation not in ROTATIONS:
+            raise ValueError(f'unknown rotation: {rotation!r}')
+        key = (self.key, n_factors, method, rotation, bounds, use_smc)
+        if key in _cache:
+            _cache.move_to_end(key)
+        else:
+            if method == 'principal':
+                loadings = _top_loadings(self._values, self._vectors, n_factors)
+            else:
+                start = np.diag(self.corr) - self.smc if use_smc else np.full(len(self.corr), 0.5)
+                loadings = _minres_loadings(self.corr, n_factors, start, bounds)
+            if rotation == 'varimax':
+                loadings = varimax(loadings)[0]
+            _cache[key] = _orient(loadings, method)
+            if len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        return _cache[key].copy()
+
+    # برازش برای چند تعداد عامل با همان تجزیه؛ خروجی دیکشنری تعداد عامل ← بارهای عاملی
+    def sweep(self, n_factors_range, method='minres', rotation='varimax', **kwargs):
+        return {k: self.loadings(k, method, rotation, **kwargs) for k in n_factors_range}
+
+
+class FactorAnalysis:
+    # تحلیل عاملی اکتشافی هم‌ارز FactorAnalyzer(method='minres'/'principal', rotation='varimax'/None)
+    # از داده خام (fit) یا مستقیماً از ماتریس همبستگی از پیش محاسبه‌شده یا جریانی (fit_corr)
+    def __init__(self, n_factors=3, rotation='varimax', method='minres', bounds=(0.005, 1), use_smc=True):
+        self.n_factors = n_factors
+        self.rotation = rotation
+        self.method = method
+        self.bounds = bounds
+        self.use_smc = use_smc
+
+    def fit(self, X):
+        return self.fit_corr(np.corrcoef(np.asarray(X, dtype=np.float64), rowvar=False))
+
+    def fit_corr(self, corr):
+        self.decomposition_ = CorrelationDecomposition(corr)
+        self.corr_ = self.decomposition_.corr
+        self.loadings_ = self.decomposition_.loadings(self.n_factors, self.method, self.rotation,
+                                                      self.bounds, self.use_smc)
+        return self
+
+    @property
+    def communalities_(self):
+        return (self.loadings_ ** 2).sum(axis=1)
+
+    @property
+    def uniquenesses_(self):
+        return 1 - self.communalities_
+
+    # واریانس، سهم و سهم تجمعی هر عامل (مانند get_factor_variance)
+    def factor_variance(self):
+        variance = (self.loadings_ ** 2).sum(axis=0)
+        proportion = variance / len(self.loadings_)
+        return variance, proportion, np.cumsum(proportion)
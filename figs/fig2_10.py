@@ -2,26 +2,24 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import arabic_reshaper
-from bidi.algorithm import get_display
-import qrcode
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from persian import bidi_text, bidi_texts
 import matplotlib.font_manager as fm
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
-
-# داده‌های ورودی
-features = ['دمای سیال','فشار سیال','لرزش','جریان سیال','رطوبت محیط']
-corr = [0.72, 0.65, 0.82, 0.45, 0.33]
-wrapper = [0.25, 0.20, 0.30, 0.15, 0.10]
-embedded = [0.28, 0.22, 0.25, 0.15, 0.10]
+from qr_overlay import add_qr
+from importance_scores import load_scores
+
+# داده‌های ورودی: امتیازهای محاسبه‌شده روی داده واقعی (RUL_Example/feature_importance.py) در صورت وجود،
+# وگرنه مقادیر نمونه
+scores = load_scores(top=5)
+if scores is not None:
+    features, corr, wrapper, embedded = scores
+else:
+    features = ['دمای سیال','فشار سیال','لرزش','جریان سیال','رطوبت محیط']
+    corr = [0.72, 0.65, 0.82, 0.45, 0.33]
+    wrapper = [0.25, 0.20, 0.30, 0.15, 0.10]
+    embedded = [0.28, 0.22, 0.25, 0.15, 0.10]
 
 # تبدیل نام ویژگی‌ها به فارسی صحیح
-persian_features = [bidi_text(feature) for feature in features]
+persian_features = bidi_texts(features)
 
 # تنظیمات نمودار
 plt.rcParams['font.family'] = 'B Nazanin'
@@ -62,29 +60,9 @@ add_labels(rects3)
 ax.grid(axis='y', alpha=0.3)
 ax.set_ylim(0, 1.0)  # محدوده محور Y از 0 تا 1
 
-# ایجاد بارکد
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=5, border=2)
-qr.add_data("https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_9.py")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد با تنظیمات صحیح
-imagebox = OffsetImage(img_np, zoom=0.6)  # کاهش zoom برای اندازه مناسب
-ab = AnnotationBbox(
-    imagebox, 
-    (0.92, 0.5),  # موقعیت در گوشه پایین سمت راست
-    xycoords='figure fraction',  # استفاده از مختصات شکل اصلی
-    box_alignment=(1, 0),  # تراز در پایین سمت راست
-    frameon=False,
-    pad=0
-)
-
-# اضافه کردن بارکد به محور فعلی
-ax.add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(ax, "https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_9.py",
+       anchor='lower right', xy=(0.92, 0.5), zoom=0.6)
 
 plt.tight_layout()
 plt.savefig('fig2-10.png', dpi=300, bbox_inches='tight')
@@ -2,17 +2,9 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import arabic_reshaper
-from bidi.algorithm import get_display
+from persian import bidi_text
 import matplotlib as mpl
-import qrcode
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
+from qr_overlay import add_qr
 
 # تنظیمات اولیه
 plt.rcParams['font.family'] = 'Adobe Arabic' #'B Nazanin'
@@ -67,29 +59,9 @@ axs[1, 1].grid(alpha=0.2)
 axs[1, 1].annotate(bidi_text('Y = 5 * sin(X) + 10'), xy=(0.4, 0.9),
                   xycoords='axes fraction', fontsize=21, color='red')
 
-# ایجاد بارکد
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=5, border=2)
-qr.add_data("https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_12.py")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد با تنظیمات صحیح
-imagebox = OffsetImage(img_np, zoom=0.6)  
-ab = AnnotationBbox(
-    imagebox, 
-    (0.2, 0.2),  # موقعیت در گوشه پایین سمت راست
-    xycoords='figure fraction',  # استفاده از مختصات شکل اصلی
-    box_alignment=(1, 0),  # تراز در پایین سمت راست
-    frameon=False,
-    pad=0
-)
-
-# اضافه کردن بارکد به محور فعلی
-axs[1, 0].add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(axs[1, 0], "https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_12.py",
+       anchor='lower right', xy=(0.2, 0.2), zoom=0.6)
 
 plt.tight_layout()
 plt.subplots_adjust(top=0.92, bottom=0.08, hspace=0.25, wspace=0.2)
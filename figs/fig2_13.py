@@ -2,19 +2,11 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
 from sklearn.datasets import make_classification
-import arabic_reshaper
-from bidi.algorithm import get_display
+from persian import bidi_text, bidi_texts
 import matplotlib as mpl
-import qrcode
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
+from qr_overlay import add_qr
+from streaming_pca import StreamingPCA, iter_chunks
 
 # تنظیمات اولیه
 plt.rcParams['font.family'] = 'Adobe Arabic'
@@ -34,20 +26,20 @@ X, y = make_classification(
 )
 
 # نام‌های ویژگی‌ها به فارسی
-feature_names = [
-    bidi_text('دما'),
-    bidi_text('فشار'),
-    bidi_text('لرزش'),
-    bidi_text('جریان'),
-    bidi_text('رطوبت'),
-    bidi_text('غلظت'),
-    bidi_text('اسیدیته'),
-    bidi_text('رسانایی')
-]
-
-# اعمال PCA
-pca = PCA()
-X_pca = pca.fit_transform(X)
+feature_names = bidi_texts([
+    'دما',
+    'فشار',
+    'لرزش',
+    'جریان',
+    'رطوبت',
+    'غلظت',
+    'اسیدیته',
+    'رسانایی'
+])
+
+# اعمال PCA به صورت تکه‌ای (حافظه محدود به اندازه تکه؛ سیکل‌های جدید با pca.partial_fit افزوده می‌شوند)
+pca = StreamingPCA().fit(iter_chunks(X, rows=100))
+X_pca = pca.transform(X)
 
 # محاسبه واریانس تجمعی
 cumulative_variance = np.cumsum(pca.explained_variance_ratio_)
@@ -112,29 +104,9 @@ for i, (v, c) in enumerate(zip(pca.explained_variance_ratio_, cumulative_varianc
 ax2.axhline(y=0.9, color='g', linestyle='--', alpha=0.7)
 ax2.text(1, 0.91, bidi_text('آستانه ۹۰٪'), color='g', fontsize=21)
 
-# ایجاد بارکد
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=5, border=2)
-qr.add_data("https://B2n.ir/xb5100")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد با تنظیمات صحیح
-imagebox = OffsetImage(img_np, zoom=0.8)  
-ab = AnnotationBbox(
-    imagebox, 
-    (0.14, 0.1),  
-    xycoords='figure fraction',  # استفاده از مختصات شکل اصلی
-    box_alignment=(1, 0), 
-    frameon=False,
-    pad=0
-)
-
-# اضافه کردن بارکد به محور فعلی
-ax1.add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(ax1, "https://B2n.ir/xb5100",
+       anchor='lower right', xy=(0.14, 0.1), zoom=0.8)
 
 plt.tight_layout()
 plt.savefig('fig2-13.png', dpi=300, bbox_inches='tight')
@@ -1,21 +1,14 @@
-!pip install qrcode[pil] arabic_reshaper python-bidi factor_analyzer
+!pip install qrcode[pil] arabic_reshaper python-bidi
 
 import numpy as np
 import matplotlib.pyplot as plt
-from factor_analyzer import FactorAnalyzer
 from sklearn.datasets import make_spd_matrix
-import arabic_reshaper
-from bidi.algorithm import get_display
+from persian import bidi_text, bidi_texts
 import seaborn as sns
 import matplotlib as mpl
-import qrcode
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
+from qr_overlay import add_qr
+from factor_analysis import FactorAnalysis
+from correlation import correlation
 
 # تنظیمات اولیه
 plt.rcParams['font.family'] = 'B Nazanin'
@@ -28,18 +21,18 @@ n_samples = 300
 n_features = 10
 
 # نام‌های متغیرها به فارسی
-feature_names = [
-    bidi_text('دمای راکتور'),
-    bidi_text('فشار مخزن'),
-    bidi_text('ارتعاش پمپ'),
-    bidi_text('جریان خروجی'),
-    bidi_text('غلظت کاتالیست'),
-    bidi_text('اسیدیته محصول'),
-    bidi_text('رسانایی سیال'),
-    bidi_text('ناخالصی‌ها'),
-    bidi_text('رطوبت گاز'),
-    bidi_text('آلودگی محیطی')
-]
+feature_names = bidi_texts([
+    'دمای راکتور',
+    'فشار مخزن',
+    'ارتعاش پمپ',
+    'جریان خروجی',
+    'غلظت کاتالیست',
+    'اسیدیته محصول',
+    'رسانایی سیال',
+    'ناخالصی‌ها',
+    'رطوبت گاز',
+    'آلودگی محیطی'
+])
 
 # ایجاد ماتریس همبستگی ساختگی
 corr_matrix = make_spd_matrix(n_features)
@@ -56,9 +49,9 @@ corr_matrix[8:, 8:] = corr_matrix[8:, 8:] * 0.2 + 0.8
 mean = np.zeros(n_features)
 X = np.random.multivariate_normal(mean, corr_matrix, size=n_samples)
 
-# تحلیل عاملی اکتشافی
-efa = FactorAnalyzer(n_factors=3, rotation='varimax')
-efa.fit(X)
+# تحلیل عاملی اکتشافی روی ماتریس همبستگی کل داده که یک‌جا با correlation محاسبه می‌شود
+efa = FactorAnalysis(n_factors=3, rotation='varimax')
+efa.fit_corr(correlation(X))
 
 # دریافت بارهای عاملی
 loadings = efa.loadings_
@@ -66,6 +59,9 @@ loadings = efa.loadings_
 # ایجاد نمودارها
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(24, 8))
 
+# نام عوامل (یک بار شکل‌دهی برای هر دو نمودار)
+factors = bidi_texts(['عامل ۱: فرآیندی', 'عامل ۲: کیفیتی', 'عامل ۳: محیطی'])
+
 # 1. نمودار حرارتی بارهای عاملی
 sns.heatmap(
     loadings,
@@ -81,15 +77,10 @@ sns.heatmap(
 ax1.set_title(bidi_text('بارهای عاملی'), fontsize=24)
 ax1.set_xlabel(bidi_text('عوامل'), fontsize=24)
 ax1.set_ylabel(bidi_text('متغیرها'), fontsize=24)
-ax1.set_xticklabels([
-    bidi_text('عامل ۱: فرآیندی'),
-    bidi_text('عامل ۲: کیفیتی'),
-    bidi_text('عامل ۳: محیطی')
-], fontsize=21)
+ax1.set_xticklabels(factors, fontsize=21)
 ax1.set_yticklabels(feature_names, rotation=360, fontsize=21)
 
 # 2. نمودار بارهای عاملی برای هر عامل
-factors = [bidi_text('عامل ۱: فرآیندی'), bidi_text('عامل ۲: کیفیتی'), bidi_text('عامل ۳: محیطی')]
 colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
 
 for i, factor in enumerate(factors):
@@ -130,29 +121,9 @@ ax2.axvline(-0.4, color='red', linestyle=':', alpha=0.5)
 ax2.grid(axis='x', alpha=0.2)
 ax2.legend(fontsize=21, loc='lower right')
 
-# ایجاد بارکد
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=5, border=2)
-qr.add_data("https://B2n.ir/jw8702")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد با تنظیمات صحیح
-imagebox = OffsetImage(img_np, zoom=0.8)  
-ab = AnnotationBbox(
-    imagebox, 
-    (0.65, 0.63),  
-    xycoords='figure fraction',  # استفاده از مختصات شکل اصلی
-    box_alignment=(1, 0), 
-    frameon=False,
-    pad=0
-)
-
-# اضافه کردن بارکد به محور فعلی
-ax2.add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(ax2, "https://B2n.ir/jw8702",
+       anchor='lower right', xy=(0.65, 0.63), zoom=0.8)
 
 plt.tight_layout()
 plt.subplots_adjust(top=0.90, wspace=0.25)
@@ -2,20 +2,14 @@ pip install qrcode[pil] arabic_reshaper python-bidi
 
 import numpy as np
 import matplotlib.pyplot as plt
-from arabic_reshaper import arabic_reshaper
-from bidi.algorithm import get_display
-import qrcode
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from persian import bidi_text as persian_text
+from qr_overlay import add_qr
+from category_scatter import scatter_by_category
 
 # تنظیمات فارسی‌نویسی
 plt.rcParams["font.family"] = "B Nazanin"
 plt.rcParams["axes.unicode_minus"] = False
 
-def persian_text(text):
-    reshaped = arabic_reshaper.reshape(text)
-    return get_display(reshaped)
-
 # تولید داده‌ها
 np.random.seed(42)
 time = np.arange(0, 35)  # زمان از 0 تا 34
@@ -36,39 +30,27 @@ pressure = np.concatenate([
 pressure[9] = 5.2   # داده پرت در بخش اول
 pressure[18] = 2.3  # داده پرت در بخش دوم
 
-# تعریف رنگ‌ها و دسته‌ها
-colors = []
-categories = []
-for i in range(len(time)):
-    if i < 15:
-        colors.append('blue')
-        categories.append(persian_text('فشار ثابت ۳ بار'))
-    elif i < 25:
-        colors.append('green')
-        categories.append(persian_text('فشار ثابت ۴ بار'))
-    else:
-        colors.append('red')
-        categories.append(persian_text('تغییر مفهومی'))
+# تعریف دسته‌ها (برچسب، رنگ) به ترتیب راهنما
+categories = [
+    (persian_text('فشار ثابت ۳ بار'), 'blue'),
+    (persian_text('فشار ثابت ۴ بار'), 'green'),
+    (persian_text('داده پرت'), 'orange'),
+    (persian_text('تغییر مفهومی'), 'red'),
+]
+
+# دسته هر نقطه بر اساس بازه زمانی آن (0 تا 14، 15 تا 24، 25 به بعد)
+codes = np.array([0, 1, 3])[np.searchsorted([15, 25], time, side='right')]
 
 # مشخص کردن داده‌های پرت
 outliers = [9, 18]
-for i in outliers:
-    colors[i] = 'orange'
-    if i < 15:
-        categories[i] = persian_text('داده پرت')
-    else:
-        categories[i] = persian_text('داده پرت')
+codes[outliers] = 2
 
 # ایجاد نمودار
 fig, ax = plt.subplots(figsize=(14, 8))
 
-# رسم نقاط با شکل مکعب
-for i in range(len(time)):
-    ax.scatter(time[i], pressure[i],
-                marker='s', s=100,
-                c=colors[i],
-                edgecolor='black',
-                label=categories[i] if i in [0, 15, 25, 5, 18] else "")
+# رسم نقاط با شکل مکعب (یک مجموعه برای هر دسته)
+handles = scatter_by_category(ax, time, pressure, codes, categories,
+                              marker='s', s=100, edgecolor='black')
 
 # افزودن خطوط راهنما
 ax.axhline(y=3.0, color='blue', linestyle='--', alpha=0.3)
@@ -85,11 +67,8 @@ ax.set_ylabel(persian_text('فشار (بار)'), fontsize=24)
 ax.grid(alpha=0.2)
 
 # ایجاد راهنما
-handles, labels = ax.get_legend_handles_labels()
-unique_labels = dict(zip(labels, handles))
 ax.legend(
-    unique_labels.values(),
-    unique_labels.keys(),
+    handles=handles,
     loc='upper left',
     fontsize=24
 )
@@ -111,31 +90,9 @@ ax.annotate(persian_text('داده پرت'),
              arrowprops=dict(facecolor='orange', arrowstyle='->'),
              fontsize=24)
 
-# =============================================================================
-# ایجاد و اضافه کردن بارکد
-# =============================================================================
-# ایجاد بارکد برای لینک 
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,box_size=5, border=2)
-qr.add_data("https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_6.py")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-
-# ذخیره موقت بارکد در حافظه
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد
-imagebox = OffsetImage(img_np, zoom=0.5)
-ab = AnnotationBbox(imagebox, (0.9, 0.08),
-                    xycoords='axes fraction',
-                    box_alignment=(1, 0.2),
-                    frameon=False,
-                    pad=0)
-
-# اضافه کردن بارکد به نمودار
-ax.add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(ax, "https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_6.py",
+       anchor='lower right', xy=(0.9, 0.03961360), xycoords='axes fraction', zoom=0.5)
 
 # ذخیره و نمایش نمودار
 plt.tight_layout()
@@ -3,18 +3,11 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from statsmodels.graphics.tsaplots import plot_acf
-import arabic_reshaper
-from bidi.algorithm import get_display
-import qrcode
-from PIL import Image
+from persian import bidi_text
 import matplotlib as mpl
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
+from qr_overlay import add_qr
+from decimate import decimated_plot
+from autocorr import acf, plot_corr
 
 # تنظیمات اولیه
 np.random.seed(42)
@@ -96,11 +89,11 @@ for year in range(3):
     ax1.axvspan(year * samples_per_year + 22, min((year+1)*samples_per_year, year * samples_per_year + 26),
                 alpha=0.2, color='blue')
 
-# رسم داده‌ها و خط روند
-ax1.plot(df['زمان'], df['مصرف_برق'], color='royalblue', linewidth=1,
-         alpha=0.7, label=bidi_text('داده‌های واقعی'))
-ax1.plot(df['زمان'], df['میانگین_متحرک'], color='red', linewidth=2.5,
-         label=bidi_text('روند مصرف (میانگین متحرک)'))
+# رسم داده‌ها و خط روند (سری‌های طولانی به پوش کمینه/بیشینه هر ستون پیکسل کاهش می‌یابند)
+decimated_plot(ax1, df['زمان'], df['مصرف_برق'], dpi=300, color='royalblue', linewidth=1,
+               alpha=0.7, label=bidi_text('داده‌های واقعی'))
+decimated_plot(ax1, df['زمان'], df['میانگین_متحرک'], dpi=300, color='red', linewidth=2.5,
+               label=bidi_text('روند مصرف (میانگین متحرک)'))
 ax1.axvline(x=trend_start, color='red', linestyle='--', alpha=0.7)
 
 # خطوط میانگین
@@ -123,7 +116,7 @@ ax1.legend(loc='upper left', ncol=2)
 
 # نمودار ۲: واریانس متحرک
 ax2 = plt.subplot(3, 1, 2)
-ax2.plot(df['زمان'], df['واریانس_متحرک'], color='green', linewidth=1.5)
+decimated_plot(ax2, df['زمان'], df['واریانس_متحرک'], dpi=300, color='green', linewidth=1.5)
 ax2.axvline(x=trend_start, color='red', linestyle='--', alpha=0.7)
 ax2.set_title(bidi_text('واریانس متحرک مصرف برق (پنجره ۲ ماهه)'), fontsize=18)
 ax2.set_xlabel(bidi_text('زمان (نمونه‌های ۱۵ روزه)'), fontsize=18)
@@ -133,7 +126,8 @@ ax2.set_ylim(0, 900)  # کاهش محدوده محور Y
 ax2.set_xlim(0, 70)
 # نمودار ۳: خودهمبستگی
 ax3 = plt.subplot(3, 1, 3)
-plot_acf(df['مصرف_برق'], lags=24, ax=ax3, color='purple')
+acf_values, confint = acf(df['مصرف_برق'], nlags=24)
+plot_corr(ax3, acf_values, confint, color='purple')
 ax3.set_title(bidi_text('نمودار خودهمبستگی'), fontsize=18)
 ax3.set_xlabel(bidi_text('لگ'), fontsize=18)
 ax3.set_ylabel(bidi_text('ضریب خودهمبستگی'), fontsize=18)
@@ -141,28 +135,9 @@ ax3.grid(alpha=0.3)
 ax3.axhline(y=0, color='black', linewidth=0.5)
 plt.tight_layout()
 
-# ایجاد بارکد برای لینک 
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,box_size=5, border=2)
-qr.add_data("https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_7.py")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-
-# ذخیره موقت بارکد در حافظه
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد
-imagebox = OffsetImage(img_np, zoom=0.5)
-ab = AnnotationBbox(imagebox, (0.9, 0.08),
-                    xycoords='axes fraction',
-                    box_alignment=(8.5, -1.2),
-                    frameon=False,
-                    pad=0)
-
-# اضافه کردن بارکد به نمودار
-ax2.add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(ax2, "https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_7.py",
+       anchor='upper left', xy=(-0.00492333, 1.01609795), xycoords='axes fraction', zoom=0.5)
 
 plt.savefig('electricity.png', dpi=300)
 plt.show()
@@ -5,17 +5,11 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
-import arabic_reshaper
-from bidi.algorithm import get_display
-import qrcode
-from PIL import Image
+from persian import bidi_text
 import matplotlib as mpl
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
-# تابع برای نمایش صحیح متون فارسی
-def bidi_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    return get_display(reshaped_text)
+from qr_overlay import add_qr
+from decimate import decimated_scatter
+from outliers import outlier_masks
 
 # تنظیمات اولیه
 plt.rcParams['font.family'] = 'Adobe Arabic' #'Microsoft Uighur'
@@ -42,6 +36,11 @@ df = pd.DataFrame({
 # محاسبه Z-Score
 df['Z-Score'] = np.abs(stats.zscore(df['دما']))
 
+# تشخیص نقاط پرت (Z-Score و IQR، همان معیار سبیل‌های نمودار جعبه‌ای)
+masks = outlier_masks(df[['دما']], methods=('zscore', 'iqr'))
+is_outlier = masks['zscore'][:, 0]
+iqr_outlier = masks['iqr'][:, 0]
+
 # ایجاد نمودارها در یک گرید 2x2
 fig, axs = plt.subplots(2, 2, figsize=(15, 12))
 
@@ -62,8 +61,8 @@ axs[0, 1].set_ylabel(bidi_text('تعداد نمونه‌ها'))
 axs[0, 1].grid(alpha=0.3)
 
 # نشان دادن نقاط پرت در هیستوگرام
-lower_outliers = df[df['دما'] < 60]
-upper_outliers = df[df['دما'] > 100]
+lower_outliers = df[iqr_outlier & (df['دما'] < df['دما'].median())]
+upper_outliers = df[iqr_outlier & (df['دما'] > df['دما'].median())]
 axs[0, 1].scatter(lower_outliers['دما'], [5]*len(lower_outliers),
                  color='red', s=50, alpha=0.7, label=bidi_text('نقاط پرت'))
 axs[0, 1].scatter(upper_outliers['دما'], [5]*len(upper_outliers),
@@ -72,9 +71,9 @@ axs[0, 1].axvline(x=60, color='orange', linestyle='--', alpha=0.5)
 axs[0, 1].axvline(x=100, color='orange', linestyle='--', alpha=0.5)
 axs[0, 1].legend()
 
-# 3. نمودار پراکندگی (Scatter Plot)
-axs[1, 0].scatter(df['زمان'], df['دما'], alpha=0.7,
-                 c=np.where(df['Z-Score'] > 3, 'red', 'blue'))
+# 3. نمودار پراکندگی (Scatter Plot)؛ در سری‌های طولانی نقاط کاهش می‌یابند ولی نقاط پرت همه حفظ می‌شوند
+decimated_scatter(axs[1, 0], df['زمان'], df['دما'], keep=is_outlier, dpi=300, alpha=0.7,
+                  c=np.where(is_outlier, 'red', 'blue'))
 axs[1, 0].set_title(bidi_text('نمودار پراکندگی دما بر اساس زمان'))
 axs[1, 0].set_xlabel(bidi_text('زمان'))
 axs[1, 0].set_ylabel(bidi_text('دما'))
@@ -87,8 +86,8 @@ axs[1, 0].axhline(y=100, color='orange', linestyle='--', alpha=0.7)
 axs[1, 0].axhline(y=60, color='orange', linestyle='--', alpha=0.7)
 
 # 4. نمودار Z-Score
-axs[1, 1].scatter(df['زمان'], df['Z-Score'], alpha=0.7,
-                 c=np.where(df['Z-Score'] > 3, 'red', 'green'))
+decimated_scatter(axs[1, 1], df['زمان'], df['Z-Score'], keep=is_outlier, dpi=300, alpha=0.7,
+                  c=np.where(is_outlier, 'red', 'green'))
 axs[1, 1].set_title(bidi_text('نمودار Z-Score برای تشخیص نقاط پرت'))
 axs[1, 1].set_xlabel(bidi_text('زمان'))
 axs[1, 1].set_ylabel(bidi_text('مقدار Z-Score'))
@@ -98,30 +97,9 @@ axs[1, 1].axhline(y=3, color='red', linestyle='--',
                   label=bidi_text('آستانه Z=3'))
 axs[1, 1].legend()
 
-# تنظیم فاصله‌گذاری
-#plt.tight_layout(rect=[0, 0, 1, 0.96])  # ایجاد فضای کافی برای عنوان اصلی
-# ایجاد بارکد برای لینک 
-qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,box_size=5, border=2)
-qr.add_data("https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_8.py")
-qr.make(fit=True)
-
-# تبدیل بارکد به تصویر
-img = qr.make_image(fill_color="black", back_color="white")
-img = img.convert("RGBA")
-
-# ذخیره موقت بارکد در حافظه
-img_np = np.array(img)
-
-# ایجاد جعبه برای بارکد
-imagebox = OffsetImage(img_np, zoom=0.5)
-ab = AnnotationBbox(imagebox, (0.9, 0.08),
-                    xycoords='axes fraction',
-                    box_alignment=(7.75, -1.7),
-                    frameon=False,
-                    pad=0)
-
-# اضافه کردن بارکد به نمودار
-axs[0, 1].add_artist(ab)
+# ایجاد بارکد برای لینک
+add_qr(axs[0, 1], "https://github.com/hojatollahgholami/AI-in-Oil-and-gas-industry/edit/main/figs/fig2_8.py",
+       anchor='upper left', xy=(-1.18796296, 0.99517857), xycoords='axes fraction', zoom=0.5)
 
 plt.savefig('fig2-9.png', dpi=300, bbox_inches='tight')
 plt.show()
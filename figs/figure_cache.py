@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from importlib import metadata
+
+import matplotlib
+import matplotlib.font_manager as fm
+
+MANIFEST = '.figure_cache.json'
+
+# کتابخانه‌هایی که نسخه آن‌ها روی خروجی شکل‌ها اثر دارد
+LIBRARIES = (
+    'matplotlib', 'numpy', 'pandas', 'scipy', 'seaborn', 'statsmodels', 'scikit-learn',
+    'qrcode', 'pillow', 'arabic_reshaper', 'python-bidi',
+)
+
+_SEED = re.compile(r'np\.random\.seed\((\d+)\)')
+_IMPORT = re.compile(r'^\s*(?:from|import)\s+([A-Za-z_]\w*)', re.M)
+_DATA = re.compile(r'[\'"]([\w.-]+\.json)[\'"]')
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return _sha256(f.read())
+
+
+def library_versions(names=LIBRARIES):
+    versions = {'python': sys.version.split()[0]}
+    for name in names:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+# تنظیمات فونت: پارامترهای rc مربوط به فونت و فهرست فونت‌های نصب‌شده (نصب B Nazanin خروجی را تغییر می‌دهد)
+def font_settings():
+    rc = {k: str(v) for k, v in matplotlib.rcParams.items() if k.startswith(('font.', 'mathtext.'))}
+    fonts = sorted({(f.name, os.path.basename(f.fname)) for f in fm.fontManager.ttflist})
+    return {'rc': rc, 'fonts': _sha256(json.dumps(fonts).encode())}
+
+
+# ماژول‌های محلی (هم‌پوشه) که یک شکل مستقیم یا غیرمستقیم (از طریق ماژول‌های محلی دیگر) از آن‌ها import
+# می‌کند و کدشان روی خروجی اثر دارد؛ پیمایش بازگشتی با مجموعه ماژول‌های دیده‌شده تا import دوری گیر نکند
+def local_imports(source, fig_dir):
+    seen = set()
+    pending = [source]
+    while pending:
+        for n in _IMPORT.findall(pending.pop()):
+            path = os.path.join(fig_dir, f'{n}.py')
+            if n not in seen and os.path.exists(path):
+                seen.add(n)
+                with open(path, encoding='utf-8') as f:
+                    pending.append(f.read())
+    return sorted(seen)
+
+
+# فایل‌های داده JSON هم‌پوشه که نامشان در کد شکل یا ماژول‌های محلی آن (در همه سطوح import) آمده
+# (مثلاً امتیازهای اهمیت ویژگی)؛ فایل ناموجود با None در کلید می‌آید تا ساخته شدن آن هم شکل را دوباره رسم کند
+def data_files(sources, fig_dir):
+    names = sorted({n for source in sources for n in _DATA.findall(source)})
+    return {n: file_digest(os.path.join(fig_dir, n)) if os.path.exists(os.path.join(fig_dir, n)) else None
+            for n in names}
+
+
+# کلید محتوایی یک شکل: کد شکل و ماژول‌های محلی آن، فایل‌های داده، seed، تنظیمات فونت، نسخه کتابخانه‌ها و dpi
+def figure_key(path, dpi=None, environment=None):
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    fig_dir = os.path.dirname(os.path.abspath(path))
+    modules = local_imports(source, fig_dir)
+    sources = [source]
+    for n in modules:
+        with open(os.path.join(fig_dir, f'{n}.py'), encoding='utf-8') as f:
+            sources.append(f.read())
+    parts = {
+        'source': _sha256(source.encode()),
+        'modules': {n: file_digest(os.path.join(fig_dir, f'{n}.py')) for n in modules},
+        'data': data_files(sources, fig_dir),
+        'seed': _SEED.findall(source),
+        'dpi': dpi,
+        'environment': environment if environment is not None else environment_key(),
+    }
+    return _sha256(json.dumps(parts, sort_keys=True).encode())
+
+
+# بخش مشترک کلید همه شکل‌ها (یک بار برای هر اجرا محاسبه می‌شود)
+def environment_key():
+    return _sha256(json.dumps({'fonts': font_settings(), 'versions': library_versions()},
+                              sort_keys=True).encode())
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    tmp = f'{path}.tmp-{os.getpid()}'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# شکل تازه است اگر کلید یکسان باشد و همه PNGهای ذخیره‌شده بدون تغییر موجود باشند
+def is_fresh(entry, key, out_dir):
+    if not entry or entry.get('key') != key or not entry.get('outputs'):
+        return False
+    for name, digest in entry['outputs'].items():
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path) or file_digest(path) != digest:
+            return False
+    return True
+
+
+def make_entry(key, out_dir, outputs):
+    return {'key': key, 'outputs': {name: file_digest(os.path.join(out_dir, name)) for name in outputs}}
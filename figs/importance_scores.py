@@ -0,0 +1,17 @@
+import json
+import os
+
+# خروجی موتور اهمیت ویژگی: python RUL_Example/feature_importance.py --out figs/feature_importance.json
+SCORES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feature_importance.json')
+
+
+# امتیازهای سه روش برای top ویژگی مهم‌تر (به ترتیب rank_by)؛ در نبود فایل None
+# خروجی (نام ویژگی‌ها، فیلتر: |همبستگی|، پوششی، درونی)
+def load_scores(top=5, rank_by='embedded', path=SCORES_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        scores = json.load(f)
+    order = sorted(range(len(scores['features'])), key=lambda j: -scores[rank_by][j])[:top]
+    pick = lambda name: [scores[name][j] for j in order]
+    return pick('features'), pick('correlation'), pick('wrapper'), pick('embedded')
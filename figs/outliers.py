@@ -0,0 +1,181 @@
+import numpy as np
+
+METHODS = ('zscore', 'mad', 'iqr', 'rolling_z')
+
+# ضریب تبدیل MAD به انحراف معیار در توزیع نرمال (Z-Score اصلاح‌شده Iglewicz و Hoaglin)
+MAD_SCALE = 0.6745
+# وقتی MAD صفر است (بیش از نیمی از مقادیر برابر میانه) مخرج 1.2533 برابر میانگین انحراف مطلق از میانه است
+MEANAD_SCALE = 1.2533
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _check_methods(methods):
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        raise ValueError(f'unknown outlier method(s): {", ".join(map(repr, unknown))}')
+
+
+# MAD هر ستون حول میانه؛ برای ستون‌های با MAD صفر معادل آن از میانگین انحراف مطلق (مخرج Z-Score اصلاح‌شده
+# ‎|x-میانه|/(1.2533·MeanAD)) جایگزین می‌شود. ستون ثابت مقیاس صفر می‌ماند و در _global_masks پرتی ندارد
+def _mad(values, median):
+    deviation = np.abs(values - median)
+    with np.errstate(invalid='ignore'):
+        mad = np.nanmedian(deviation, axis=0)
+        mean_ad = np.nanmean(deviation, axis=0)
+    return np.where(mad > 0, mad, MAD_SCALE * MEANAD_SCALE * mean_ad)
+
+
+# نقاط پرت با آماره‌های از پیش محاسبه‌شده هر حسگر (میانگین/انحراف معیار و چارک‌ها)
+def _global_masks(values, methods, mean, std, quartiles, mad, z, mad_z, iqr_k):
+    masks = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'zscore' in methods:
+            masks['zscore'] = np.abs(values - mean) / std > z
+        if 'mad' in methods:
+            masks['mad'] = (mad > 0) & (MAD_SCALE * np.abs(values - quartiles[1]) / mad > mad_z)
+        if 'iqr' in methods:
+            iqr = quartiles[2] - quartiles[0]
+            masks['iqr'] = (values < quartiles[0] - iqr_k * iqr) | (values > quartiles[2] + iqr_k * iqr)
+    return masks
+
+
+# Z-Score متحرک: هر نمونه با میانگین و انحراف معیار window نمونه قبلی همان حسگر (بدون خودش) مقایسه می‌شود
+# history: نمونه‌های پیش از values (برای ادامه پنجره در حالت تکه‌ای)
+def rolling_z_mask(values, window, z=3.0, min_periods=None, history=None):
+    values = _as_2d(values)
+    n = len(values)
+    data = values if history is None or not len(history) else np.vstack([history, values])
+    offset = len(data) - n
+    valid = ~np.isnan(data)
+    center = np.nanmean(data, axis=0) if valid.any() else np.zeros(data.shape[1])
+    center = np.where(np.isnan(center), 0.0, center)
+    centered = np.where(valid, data - center, 0.0)
+    # جمع تجمعی با یک سطر صفر در ابتدا: cs[t] مجموع سطرهای پیش از t است
+    cs = np.zeros((len(data) + 1, data.shape[1]))
+    cs2 = np.zeros_like(cs)
+    cn = np.zeros_like(cs)
+    np.cumsum(centered, axis=0, out=cs[1:])
+    np.cumsum(centered ** 2, axis=0, out=cs2[1:])
+    np.cumsum(valid, axis=0, out=cn[1:])
+    rows = np.arange(offset, len(data))
+    lo = np.maximum(rows - window, 0)
+    s1 = cs[rows] - cs[lo]
+    s2 = cs2[rows] - cs2[lo]
+    count = cn[rows] - cn[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = s1 / count
+        std = np.sqrt(np.maximum(s2 / count - mean ** 2, 0.0) * count / (count - 1))
+        score = np.abs(centered[offset:] - mean) / std
+    return valid[offset:] & (count >= (window if min_periods is None else max(min_periods, 2))) & (score > z)
+
+
+# تشخیص نقاط پرت روی آرایه (زمان × حسگر) با چند روش در یک گذر؛ خروجی دیکشنری روش ← ماسک بولی هم‌شکل داده
+# zscore: |x-میانگین|/انحراف معیار (ddof=0 مانند scipy.stats.zscore) بیشتر از z
+# mad: Z-Score اصلاح‌شده بر اساس میانه و MAD بیشتر از mad_z
+# iqr: بیرون از [Q1-k·IQR, Q3+k·IQR] (همان نقاط بیرون از سبیل‌های نمودار جعبه‌ای)
+# rolling_z: Z-Score نسبت به window نمونه قبلی؛ در برابر رانش تدریجی مقاوم است
+# مقادیر NaN هرگز پرت علامت‌گذاری نمی‌شوند
+def outlier_masks(values, methods=METHODS, z=3.0, mad_z=3.5, iqr_k=1.5, window=24, min_periods=None):
+    _check_methods(methods)
+    values = _as_2d(values)
+    mean = std = quartiles = mad = None
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if 'zscore' in methods:
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0)
+        if 'mad' in methods or 'iqr' in methods:
+            quartiles = np.nanpercentile(values, [25, 50, 75], axis=0)
+        if 'mad' in methods:
+            mad = _mad(values, quartiles[1])
+    masks = _global_masks(values, methods, mean, std, quartiles, mad, z, mad_z, iqr_k)
+    if 'rolling_z' in methods:
+        masks['rolling_z'] = rolling_z_mask(values, window, z, min_periods)
+    return {m: masks[m] for m in methods}
+
+
+class OutlierScanner:
+    # حالت تکه‌ای/جریانی برای داده‌هایی که در حافظه جا نمی‌شوند (مثلاً یک ماه داده historian)
+    # میانگین و واریانس هر حسگر با ادغام Welford/Chan بین تکه‌ها به‌روز می‌شود؛ میانه و چارک‌ها از یک
+    # نمونه مخزنی (reservoir) با اندازه ثابت از سطرها تخمین زده می‌شوند (تا پر شدن مخزن دقیق است)
+    # و چند سطر آخر هر تکه برای ادامه پنجره Z-Score متحرک نگه داشته می‌شود
+    # دو روش استفاده: برخط با scan (هر تکه با آمار تا همان تکه)، یا دو گذری با update روی همه تکه‌ها و سپس masks
+    def __init__(self, n_sensors, methods=METHODS, z=3.0, mad_z=3.5, iqr_k=1.5, window=24, min_periods=None,
+                 reservoir=4096, seed=42):
+        _check_methods(methods)
+        self.methods = tuple(methods)
+        self.z = z
+        self.mad_z = mad_z
+        self.iqr_k = iqr_k
+        self.window = window
+        self.min_periods = min_periods
+        self.count = np.zeros(n_sensors)
+        self.mean = np.zeros(n_sensors)
+        self.m2 = np.zeros(n_sensors)
+        self.rows_seen = 0
+        self._reservoir = np.full((reservoir, n_sensors), np.nan)
+        self._rng = np.random.default_rng(seed)
+        self._tail = np.zeros((0, n_sensors))
+
+    @property
+    def std(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / self.count)
+
+    def update(self, chunk):
+        chunk = _as_2d(chunk)
+        if not len(chunk):
+            return self
+        valid = ~np.isnan(chunk)
+        n = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk_mean = np.where(n > 0, np.nansum(chunk, axis=0) / n, 0.0)
+        chunk_m2 = np.nansum(np.where(valid, chunk - chunk_mean, 0.0) ** 2, axis=0)
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean += np.where(total > 0, delta * n / total, 0.0)
+            self.m2 += chunk_m2 + np.where(total > 0, delta ** 2 * self.count * n / total, 0.0)
+        self.count = total
+        self._sample(chunk)
+        return self
+
+    # نمونه‌گیری مخزنی (الگوریتم R) روی سطرها؛ سطر g با احتمال size/(g+1) جایگزین یک سطر تصادفی مخزن می‌شود
+    def _sample(self, chunk):
+        size = len(self._reservoir)
+        g = self.rows_seen + np.arange(len(chunk))
+        self.rows_seen += len(chunk)
+        slot = np.where(g < size, g, self._rng.integers(0, g + 1))
+        keep = slot < size
+        slot, rows = slot[keep], np.flatnonzero(keep)
+        # اگر چند سطر به یک خانه برسند، آخرین سطر می‌ماند (مانند اجرای ترتیبی)
+        _, last = np.unique(slot[::-1], return_index=True)
+        last = len(slot) - 1 - last
+        self._reservoir[slot[last]] = chunk[rows[last]]
+
+    def quartiles(self):
+        filled = self._reservoir[:min(self.rows_seen, len(self._reservoir))]
+        with np.errstate(invalid='ignore'):
+            q = np.nanpercentile(filled, [25, 50, 75], axis=0)
+        return q, _mad(filled, q[1])
+
+    # ماسک‌های یک تکه با آمار فعلی؛ تکه‌ها باید به ترتیب زمانی داده شوند تا پنجره متحرک پیوسته بماند
+    def masks(self, chunk):
+        chunk = _as_2d(chunk)
+        quartiles = mad = None
+        if 'mad' in self.methods or 'iqr' in self.methods:
+            quartiles, mad = self.quartiles()
+        masks = _global_masks(chunk, self.methods, self.mean, self.std, quartiles, mad,
+                              self.z, self.mad_z, self.iqr_k)
+        if 'rolling_z' in self.methods:
+            masks['rolling_z'] = rolling_z_mask(chunk, self.window, self.z, self.min_periods, self._tail)
+            self._tail = np.vstack([self._tail, chunk])[-self.window:]
+        return {m: masks[m] for m in self.methods}
+
+    # حالت برخط: هر تکه ابتدا به آمار افزوده و سپس بررسی می‌شود
+    def scan(self, chunks):
+        for chunk in chunks:
+            yield self.update(chunk).masks(chunk)
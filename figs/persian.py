@@ -0,0 +1,18 @@
+import functools
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+# یک شکل‌دهنده برای همه فراخوانی‌ها؛ پیکربندی آن فقط یک بار ساخته می‌شود
+_reshaper = arabic_reshaper.ArabicReshaper()
+
+
+# تابع برای نمایش صحیح متون فارسی؛ هر متن فقط یک بار شکل‌دهی و bidi می‌شود
+@functools.lru_cache(maxsize=4096)
+def bidi_text(text):
+    return get_display(_reshaper.reshape(text))
+
+
+# شکل‌دهی یک فهرست از برچسب‌ها (مثلاً نام ویژگی‌ها یا برچسب‌های محور)
+def bidi_texts(texts):
+    return [bidi_text(text) for text in texts]
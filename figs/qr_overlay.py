@@ -0,0 +1,68 @@
+import functools
+import hashlib
+import os
+
+import numpy as np
+from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.qr_cache')
+
+# نقطه مرجع بارکد بر اساس نام؛ مقدار: (موقعیت پیش‌فرض در کادر، تراز جعبه بارکد نسبت به آن نقطه)
+ANCHORS = {
+    'lower left': ((0.0, 0.0), (0.0, 0.0)),
+    'lower center': ((0.5, 0.0), (0.5, 0.0)),
+    'lower right': ((1.0, 0.0), (1.0, 0.0)),
+    'center left': ((0.0, 0.5), (0.0, 0.5)),
+    'center': ((0.5, 0.5), (0.5, 0.5)),
+    'center right': ((1.0, 0.5), (1.0, 0.5)),
+    'upper left': ((0.0, 1.0), (0.0, 1.0)),
+    'upper center': ((0.5, 1.0), (0.5, 1.0)),
+    'upper right': ((1.0, 1.0), (1.0, 1.0)),
+}
+
+
+def _cache_path(url, box_size, border):
+    key = hashlib.sha256(f'{url}|{box_size}|{border}'.encode()).hexdigest()[:32]
+    return os.path.join(CACHE_DIR, f'{key}.npy')
+
+
+# تصویر RGBA بارکد یک لینک؛ ابتدا از حافظه (LRU)، سپس از دیسک، و فقط در نبود آن با qrcode ساخته می‌شود
+@functools.lru_cache(maxsize=64)
+def qr_bitmap(url, box_size=5, border=2):
+    path = _cache_path(url, box_size, border)
+    if os.path.exists(path):
+        img_np = np.load(path)
+    else:
+        # qrcode و PIL فقط وقتی بارکد در حافظه نهان نیست بارگذاری می‌شوند
+        import qrcode
+        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,
+                           box_size=box_size, border=border)
+        qr.add_data(url)
+        qr.make(fit=True)
+        img = qr.make_image(fill_color="black", back_color="white").convert("RGBA")
+        img_np = np.array(img)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f'{path}.tmp-{os.getpid()}.npy'
+        np.save(tmp, img_np)
+        os.replace(tmp, path)
+    img_np.setflags(write=False)
+    return img_np
+
+
+# افزودن بارکد به یک محور؛ anchor گوشه‌ای از بارکد است که روی xy قرار می‌گیرد
+# اگر xy داده نشود، بارکد در همان گوشه از کادر (محور یا کل شکل، بسته به xycoords) قرار می‌گیرد
+def add_qr(ax, url, anchor='lower right', xy=None, xycoords='figure fraction', zoom=0.5):
+    if anchor not in ANCHORS:
+        raise ValueError(f'unknown anchor {anchor!r}; expected one of {", ".join(ANCHORS)}')
+    default_xy, alignment = ANCHORS[anchor]
+    imagebox = OffsetImage(qr_bitmap(url), zoom=zoom)
+    ab = AnnotationBbox(
+        imagebox,
+        default_xy if xy is None else xy,
+        xycoords=xycoords,
+        box_alignment=alignment,
+        frameon=False,
+        pad=0
+    )
+    ax.add_artist(ab)
+    return ab
@@ -0,0 +1,107 @@
+import numpy as np
+from scipy import linalg
+
+from streaming_pca import flip_signs, iter_chunks
+
+
+# ضرب داده مرکزی‌شده در ماتریس‌های باریک بدون ساختن کپی مرکزی‌شده X:
+# (X - 1·μ)·W = X·W - 1·(μ·W)  و  (X - 1·μ)ᵀ·Y = Xᵀ·Y - μᵀ·(1ᵀ·Y)
+def _centered_dot(X, mean, W):
+    return X @ W - mean @ W
+
+
+def _centered_tdot(X, mean, Y):
+    return X.T @ Y - np.outer(mean, Y.sum(axis=0))
+
+
+def _orthonormal(Y, basis):
+    # دو بار متعامدسازی نسبت به پایه موجود برای پایداری عددی (Gram-Schmidt دوباره)
+    for _ in range(2):
+        Y = Y - basis @ (basis.T @ Y)
+    return linalg.qr(Y, mode='economic', check_finite=False)[0]
+
+
+# میانگین و مجموع واریانس ستون‌ها (اثر ماتریس کوواریانس) به صورت تکه‌ای، بدون تجزیه
+def _moments(X, rows=4096):
+    mean = np.zeros(X.shape[1])
+    for chunk in iter_chunks(X, rows):
+        mean += chunk.sum(axis=0)
+    mean /= len(X)
+    total = 0.0
+    for chunk in iter_chunks(X, rows):
+        total += ((chunk - mean) ** 2).sum()
+    return mean, total / max(len(X) - 1, 1)
+
+
+class RandomizedPCA:
+    # PCA کاهش‌یافته با SVD تصادفی (Halko و همکاران) برای داده‌های پهن با هزاران ستون
+    # با n_components تعداد ثابت مؤلفه و با variance (مثلاً 0.9) کوچک‌ترین k که به آن سهم واریانس
+    # می‌رسد محاسبه می‌شود: پایه زیرفضای برد به صورت بلوک به بلوک (هر بلوک block بردار تصادفی با n_iter
+    # تکرار توانی) بزرگ می‌شود تا واریانس تجمعی مؤلفه‌های مطمئن (oversamples مؤلفه آخر کنار گذاشته
+    # می‌شوند) به هدف برسد؛ مخرج سهم واریانس اثر ماتریس کوواریانس است که بدون تجزیه کامل به دست می‌آید.
+    # هزینه O(n·d·k) و حافظه O((n+d)·k) به جای تجزیه کامل O(n·d·min(n,d))؛ داده مرکزی‌شده کپی نمی‌شود
+    # ویژگی‌های خروجی هم‌نام sklearn.decomposition.PCA هستند
+    def __init__(self, n_components=None, variance=None, block=16, oversamples=10, n_iter=7, seed=42):
+        if (n_components is None) == (variance is None):
+            raise ValueError('exactly one of n_components or variance must be given')
+        if variance is not None and not 0 < variance <= 1:
+            raise ValueError(f'variance must be in (0, 1], got {variance!r}')
+        self.n_components = n_components
+        self.variance = variance
+        self.block = block
+        self.oversamples = oversamples
+        self.n_iter = n_iter
+        self.seed = seed
+
+    def _range_block(self, X, basis, size, rng):
+        Y = _centered_dot(X, self.mean_, rng.standard_normal((X.shape[1], size)))
+        Y = _orthonormal(Y, basis)
+        for _ in range(self.n_iter):
+            Z = linalg.qr(_centered_tdot(X, self.mean_, Y), mode='economic', check_finite=False)[0]
+            Y = _orthonormal(_centered_dot(X, self.mean_, Z), basis)
+        return Y
+
+    def fit(self, X):
+        X = np.asarray(X)
+        if not np.issubdtype(X.dtype, np.floating):
+            X = X.astype(np.float64)
+        n, d = X.shape
+        limit = min(n, d)
+        self.mean_, self.total_variance_ = _moments(X)
+        rng = np.random.default_rng(self.seed)
+        basis = np.zeros((n, 0))
+        projected = np.zeros((0, d))
+        wanted = None if self.n_components is None else min(self.n_components, limit)
+        while True:
+            if wanted is not None:
+                size = wanted + self.oversamples - basis.shape[1]
+            else:
+                size = self.block if basis.shape[1] else self.block + self.oversamples
+            size = min(size, limit - basis.shape[1])
+            Q = self._range_block(X, basis, size, rng)
+            basis = np.hstack([basis, Q])
+            # تصویر داده روی پایه فقط برای بلوک جدید محاسبه و به سطرهای قبلی افزوده می‌شود
+            projected = np.vstack([projected, _centered_tdot(X, self.mean_, Q).T])
+            _, S, Vt = linalg.svd(projected, full_matrices=False, check_finite=False)
+            variance = S ** 2 / max(n - 1, 1)
+            full = basis.shape[1] >= limit
+            if wanted is not None:
+                k = wanted
+                break
+            reliable = len(S) if full else len(S) - self.oversamples
+            reached = np.flatnonzero(np.cumsum(variance[:reliable]) >= self.variance * self.total_variance_)
+            if len(reached) or full:
+                k = reached[0] + 1 if len(reached) else len(S)
+                break
+        self.n_components_ = k
+        self.components_ = flip_signs(Vt[:k])
+        self.explained_variance_ = variance[:k]
+        self.explained_variance_ratio_ = variance[:k] / self.total_variance_
+        self.singular_values_ = S[:k]
+        return self
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) @ self.components_.T
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
@@ -0,0 +1,139 @@
+import argparse
+import glob
+import importlib
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from figure_cache import environment_key, figure_key, is_fresh, load_manifest, make_entry, save_manifest
+
+FIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# کتابخانه‌های مشترک همه شکل‌ها یک بار در پردازش اصلی بارگذاری می‌شوند؛
+# پردازش‌های کارگر (fork) آن‌ها را بدون هزینه دوباره به ارث می‌برند
+SHARED_MODULES = (
+    'numpy', 'pandas', 'seaborn', 'scipy.stats', 'statsmodels.graphics.tsaplots',
+    'sklearn.decomposition', 'sklearn.datasets',
+    'arabic_reshaper', 'bidi.algorithm', 'qrcode', 'PIL.Image', 'matplotlib.offsetbox',
+)
+
+
+def preload(modules=SHARED_MODULES):
+    missing = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            missing.append(name)
+    return missing
+
+
+def figure_scripts(fig_dir=FIG_DIR):
+    return sorted(glob.glob(os.path.join(fig_dir, 'fig2_*.py')))
+
+
+# خواندن کد یک شکل بدون خط‌های مخصوص notebook (مانند !pip install)؛
+# خط‌ها خالی می‌شوند تا شماره خط‌ها در پیام خطا درست بماند
+def load_script(path):
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    kept = ['' if line.lstrip().startswith(('!', 'pip install', '%')) else line for line in lines]
+    return compile('\n'.join(kept) + '\n', path, 'exec')
+
+
+# اجرای یک شکل در پردازش کارگر؛ هر شکل در پوشه موقت خودش ذخیره و سپس به out_dir منتقل می‌شود
+def render_one(path, out_dir, dpi=None):
+    start = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix='.render-', dir=out_dir)
+    cwd = os.getcwd()
+    save = Figure.savefig
+    plt.show = lambda *args, **kwargs: None
+    if dpi is not None:
+        Figure.savefig = lambda self, *args, **kwargs: save(self, *args, **{**kwargs, 'dpi': dpi})
+    try:
+        os.chdir(work_dir)
+        # تنظیمات rcParams یک شکل (مثلاً font.size) نباید به شکل بعدی همین پردازش منتقل شود
+        with matplotlib.rc_context():
+            exec(load_script(path), {'__name__': '__main__', '__file__': path})
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        os.chdir(cwd)
+        Figure.savefig = save
+        plt.close('all')
+    outputs = sorted(os.listdir(work_dir))
+    for name in outputs:
+        os.replace(os.path.join(work_dir, name), os.path.join(out_dir, name))
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return {'script': os.path.basename(path), 'seconds': time.perf_counter() - start,
+            'outputs': outputs, 'error': error}
+
+
+# شکل‌هایی که کلید محتوایی آن‌ها تغییر نکرده دوباره رسم نمی‌شوند (مگر با force)
+def render_all(scripts, out_dir, workers=None, dpi=None, force=False):
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    environment = environment_key()
+    keys = {path: figure_key(path, dpi, environment) for path in scripts}
+    results = {}
+    todo = []
+    for path in scripts:
+        name = os.path.basename(path)
+        if not force and is_fresh(manifest.get(name), keys[path], out_dir):
+            results[path] = {'script': name, 'seconds': 0.0, 'outputs': sorted(manifest[name]['outputs']),
+                             'error': None, 'cached': True}
+        else:
+            todo.append(path)
+    if todo:
+        missing = preload()
+        if missing:
+            print('not installed:', ', '.join(missing), file=sys.stderr)
+        if FIG_DIR not in sys.path:
+            sys.path.insert(0, FIG_DIR)
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with ProcessPoolExecutor(max_workers=workers or min(len(todo), os.cpu_count() or 1), mp_context=ctx) as pool:
+            jobs = {path: pool.submit(render_one, path, out_dir, dpi) for path in todo}
+            for path, job in jobs.items():
+                result = results[path] = {**job.result(), 'cached': False}
+                if result['error'] is None:
+                    manifest[result['script']] = make_entry(keys[path], out_dir, result['outputs'])
+        save_manifest(out_dir, manifest)
+    return [results[path] for path in scripts]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render every figs/fig2_*.py headlessly in parallel')
+    parser.add_argument('scripts', nargs='*', help='scripts to render (default: all fig2_*.py)')
+    parser.add_argument('--out', default=os.path.join(FIG_DIR, 'build'), help='output directory for PNGs')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dpi', type=int, default=None, help='override the dpi passed to savefig')
+    parser.add_argument('--force', action='store_true', help='re-render even when the cached PNGs are current')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = render_all([os.path.abspath(s) for s in args.scripts] or figure_scripts(), args.out,
+                         args.workers, args.dpi, args.force)
+    for r in results:
+        status = 'FAILED' if r['error'] else ', '.join(r['outputs']) + (' (cached)' if r['cached'] else '')
+        print(f"{r['script']:12s} {r['seconds']:7.2f} s  {status}")
+        if r['error']:
+            print(r['error'], file=sys.stderr)
+    print(f'total {time.perf_counter() - start:.2f} s')
+    return 1 if any(r['error'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
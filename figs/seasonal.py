@@ -0,0 +1,122 @@
+import numpy as np
+
+MODELS = ('additive', 'multiplicative')
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+# طول پنجره میانگین متحرک مرکزی روند: period برای دوره فرد و period+1 (2×m با وزن نیم در دو سر) برای دوره زوج
+def trend_window(period):
+    return period + 1 if period % 2 == 0 else period
+
+
+# روند با میانگین متحرک مرکزی (مانند statsmodels.seasonal_decompose)، با جمع تجمعی برای همه ستون‌ها
+# سطرهایی که پنجره کامل ندارند (یا NaN در پنجره دارند) NaN می‌شوند
+def centered_trend(values, period):
+    values = _as_2d(values)
+    n = len(values)
+    window = trend_window(period)
+    half = window // 2
+    trend = np.full(values.shape, np.nan)
+    if n < window:
+        return trend
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore'):
+        center = np.nanmean(values, axis=0) if valid.any() else np.zeros(values.shape[1])
+    center = np.where(np.isnan(center), 0.0, center)
+    # NaNها صفر می‌شوند و تعداد مقادیر معتبر هر پنجره با جمع تجمعی جداگانه شمرده می‌شود
+    x = np.where(valid, values - center, 0.0)
+    cs = np.zeros((n + 1, values.shape[1]))
+    cn = np.zeros((n + 1, values.shape[1]))
+    np.cumsum(x, axis=0, out=cs[1:])
+    np.cumsum(valid, axis=0, out=cn[1:])
+    total = cs[window:] - cs[:-window]
+    if period % 2 == 0:
+        total -= 0.5 * (x[:n - window + 1] + x[window - 1:])
+    complete = cn[window:] - cn[:-window] == window
+    trend[half:n - half] = np.where(complete, total / period + center, np.nan)
+    return trend
+
+
+# مجموع و تعداد مقادیر غیر NaN به تفکیک فاز فصلی، با حساب اندیس (بدون حلقه روی سال‌ها):
+# سطرها با فاصله‌گذاری در دو سر در شبکه (دوره × فاز × ستون) چیده و روی محور دوره جمع می‌شوند
+def phase_sums(values, period, first_phase=0):
+    values = _as_2d(values)
+    lead = first_phase % period
+    cycles = -(-(lead + len(values)) // period)
+    grid = np.full((cycles * period, values.shape[1]), np.nan)
+    grid[lead:lead + len(values)] = values
+    grid = grid.reshape(cycles, period, values.shape[1])
+    valid = ~np.isnan(grid)
+    return np.where(valid, grid, 0.0).sum(axis=0), valid.sum(axis=0)
+
+
+class SeasonalDecomposer:
+    # تجزیه کلاسیک سری‌های زمانی (روند، الگوی فصلی، باقیمانده) برای چند کنتور به طور هم‌زمان
+    # الگوی فصلی میانگین مقدار بدون روند در هر فاز است و با update به صورت افزایشی به‌روز می‌شود:
+    # فقط مجموع و تعداد هر فاز و window-1 سطر آخر (برای روند مرکزی سطرهای بعدی) نگه داشته می‌شود،
+    # پس هزینه افزودن داده یک روز جدید به اندازه همان داده است نه کل تاریخچه
+    def __init__(self, period, n_series=1, model='additive'):
+        if model not in MODELS:
+            raise ValueError(f'unknown decomposition model: {model!r}')
+        self.period = period
+        self.model = model
+        self.t = 0
+        self.done = 0
+        self.sums = np.zeros((period, n_series))
+        self.counts = np.zeros((period, n_series))
+        self._buffer = np.zeros((0, n_series))
+
+    def _detrend(self, values, trend):
+        return values - trend if self.model == 'additive' else values / trend
+
+    # افزودن سطرهای جدید (به ترتیب زمانی)؛ سطری که حالا پنجره روند کامل دارد به میانگین فاز خود افزوده می‌شود
+    def update(self, chunk):
+        chunk = _as_2d(chunk)
+        if not len(chunk):
+            return self
+        data = np.vstack([self._buffer, chunk])
+        start = self.t - len(self._buffer)
+        # از سطر self.done به بعد هنوز به میانگین فازها افزوده نشده‌اند؛ half سطر آخر منتظر داده بعدی می‌مانند
+        ready = slice(self.done - start, len(data) - trend_window(self.period) // 2)
+        if ready.stop > ready.start:
+            trend = centered_trend(data, self.period)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                detrended = self._detrend(data[ready], trend[ready])
+            sums, counts = phase_sums(detrended, self.period, self.done)
+            self.sums += sums
+            self.counts += counts
+            self.done = start + ready.stop
+        self.t += len(chunk)
+        self._buffer = data[len(data) - trend_window(self.period) + 1:]
+        return self
+
+    # الگوی فصلی هر فاز (شکل دوره × ستون)؛ در مدل جمعی میانگین آن صفر و در مدل ضربی یک است
+    @property
+    def profile(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = self.sums / self.counts
+            if self.model == 'additive':
+                return averages - np.nanmean(averages, axis=0)
+            return averages / np.nanmean(averages, axis=0)
+
+    # اجزای تجزیه برای سطرهای values که از اندیس زمانی start شروع می‌شوند، با الگوی فصلی فعلی
+    def components(self, values, start=0):
+        values = _as_2d(values)
+        trend = centered_trend(values, self.period)
+        seasonal = self.profile[(start + np.arange(len(values))) % self.period]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.model == 'additive':
+                resid = values - trend - seasonal
+            else:
+                resid = values / (trend * seasonal)
+        return trend, seasonal, resid
+
+
+# تجزیه یک‌باره (روند، فصلی، باقیمانده) همه ستون‌های values با دوره period؛ هم‌ارز statsmodels.seasonal_decompose
+def seasonal_decompose(values, period, model='additive'):
+    values = _as_2d(values)
+    return SeasonalDecomposer(period, values.shape[1], model).update(values).components(values)
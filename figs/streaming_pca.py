@@ -0,0 +1,110 @@
+import numpy as np
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+# تکه‌های سطری پیاپی یک آرایه (یا memmap) به صورت float64؛ در هر لحظه فقط یک تکه در حافظه است
+def iter_chunks(array, rows=4096):
+    for start in range(0, len(array), rows):
+        yield np.asarray(array[start:start + rows], dtype=np.float64)
+
+
+# خواندن تکه‌ای یک فایل .npy بزرگ از روی دیسک با memmap
+def load_chunks(path, rows=4096):
+    return iter_chunks(np.load(path, mmap_mode='r'), rows)
+
+
+# علامت هر مؤلفه مانند sklearn (svd_flip با u_based_decision=False): بزرگ‌ترین درایه از نظر قدرمطلق مثبت است
+def flip_signs(components):
+    pivot = components[np.arange(len(components)), np.argmax(np.abs(components), axis=1)]
+    signs = np.where(pivot < 0, -1.0, 1.0)
+    return components * signs[:, None]
+
+
+class StreamingPCA:
+    # PCA روی داده‌ای که به صورت تکه‌ای (از دیسک، memmap یا سیکل‌های تازه) می‌رسد
+    # فقط تعداد، میانگین و ماتریس پراکندگی (ویژگی × ویژگی) با ادغام Chan بین تکه‌ها نگه داشته می‌شود،
+    # پس حافظه به اندازه تکه و تعداد ویژگی‌هاست نه تعداد سطرها. مؤلفه‌ها با تجزیه ویژه کوواریانس در
+    # اولین دسترسی محاسبه و تا تکه بعدی نگه داشته می‌شوند؛ با partial_fit مدل بدون برازش دوباره به‌روز می‌شود
+    # decay: ضریب فراموشی وزن داده‌های قبلی پیش از افزودن هر تکه (1 یعنی همه تاریخچه هم‌وزن)
+    # ویژگی‌های خروجی هم‌نام sklearn.decomposition.PCA هستند
+    def __init__(self, n_components=None, decay=1.0):
+        self.n_components = n_components
+        self.decay = decay
+        self.n_samples_seen_ = 0.0
+        self.mean_ = None
+        self.scatter = None
+        self._model = None
+
+    def partial_fit(self, chunk):
+        chunk = _as_2d(chunk)
+        if not len(chunk):
+            return self
+        if self.mean_ is None:
+            self.mean_ = np.zeros(chunk.shape[1])
+            self.scatter = np.zeros((chunk.shape[1], chunk.shape[1]))
+        if self.decay != 1.0:
+            self.n_samples_seen_ *= self.decay
+            self.scatter *= self.decay
+        n = len(chunk)
+        chunk_mean = chunk.mean(axis=0)
+        centered = chunk - chunk_mean
+        total = self.n_samples_seen_ + n
+        delta = chunk_mean - self.mean_
+        self.scatter += centered.T @ centered + np.outer(delta, delta) * (self.n_samples_seen_ * n / total)
+        self.mean_ += delta * (n / total)
+        self.n_samples_seen_ = total
+        self._model = None
+        return self
+
+    def fit(self, chunks):
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    @property
+    def covariance_(self):
+        return self.scatter / max(self.n_samples_seen_ - 1, 1)
+
+    def _decompose(self):
+        if self._model is None:
+            variance, vectors = np.linalg.eigh(self.covariance_)
+            order = np.argsort(variance)[::-1]
+            variance = np.maximum(variance[order], 0.0)
+            components = flip_signs(vectors[:, order].T)
+            self._model = variance, components
+        return self._model
+
+    @property
+    def n_components_(self):
+        width = len(self.mean_)
+        return width if self.n_components is None else min(self.n_components, width)
+
+    @property
+    def components_(self):
+        return self._decompose()[1][:self.n_components_]
+
+    @property
+    def explained_variance_(self):
+        return self._decompose()[0][:self.n_components_]
+
+    # سهم هر مؤلفه از واریانس کل (اثر ماتریس کوواریانس، شامل مؤلفه‌های کنار گذاشته‌شده)
+    @property
+    def explained_variance_ratio_(self):
+        variance = self._decompose()[0]
+        return variance[:self.n_components_] / variance.sum()
+
+    @property
+    def singular_values_(self):
+        return np.sqrt(self.explained_variance_ * max(self.n_samples_seen_ - 1, 1))
+
+    def transform(self, X):
+        return (_as_2d(X) - self.mean_) @ self.components_.T
+
+    # تبدیل تکه‌ای داده بزرگ؛ خروجی مولد امتیازهای هر تکه
+    def transform_chunks(self, chunks):
+        for chunk in chunks:
+            yield self.transform(chunk)